@@ -13,6 +13,7 @@ except (RuntimeError, ValueError) as e:
     print(f"Skipping nest_asyncio patch: {e}")
 
 # Standard library imports
+import asyncio
 import os
 import json
 import re
@@ -22,7 +23,14 @@ from typing import Dict, List, Any, Optional
 
 # FastAPI imports
 from fastapi import FastAPI, UploadFile, File, Body, HTTPException, status, Path, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+
+# orjson is optional; search responses fall back to the standard JSON encoder
+try:
+    import orjson  # noqa: F401
+    SEARCH_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    SEARCH_RESPONSE_CLASS = JSONResponse
 
 # Local imports - Configuration
 from config import (
@@ -33,6 +41,7 @@ from config import (
     API_CONTACT,
     API_LICENSE,
     TAGS_METADATA,
+    INGEST_CONCURRENCY,
     setup_logging
 )
 
@@ -65,14 +74,15 @@ from api_docs import (
 )
 
 # External dependencies
-from file_util_enhanced import get_file_manager, list_files as list_directory
+from file_util_enhanced import get_file_manager, list_files as list_directory, map_files_by_stem
 from file_parser import parse_file_with_llama_parse
 from doc_summarizer import summarize_text_content
 from question_gen import generate_questions
 from faq_gen import generate_faq
 from excel_agent import create_excel_agent
 from ingest_docs import ingest_documents_to_pinecone_and_bm25
-from hybrid_search import execure_hybrid_chain
+from hybrid_search import (aexecute_hybrid_chain, asearch_with_debug_info, astream_hybrid_chain,
+                           invalidate_search_caches, close_async_clients)
 
 # Initialize logging and file manager
 logger = setup_logging()
@@ -142,6 +152,29 @@ def is_meaningful_document_result(document_result) -> tuple[bool, str]:
     return True, "Result appears meaningful"
 
 
+# Bounds the ingestions running at once so concurrent uploads queue instead of
+# multiplying embedding and upsert traffic past the OpenAI and Pinecone rate limits
+ingest_semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
+
+
+async def run_ingestion(base_filename: str) -> dict:
+    """
+    Ingest a parsed document to Pinecone and BM25 without blocking the event loop.
+    
+    Args:
+        base_filename: Base name of the parsed file to ingest
+        
+    Returns:
+        The ingestion result dictionary
+    """
+    async with ingest_semaphore:
+        # Ingestion blocks on embedding and upsert round trips, so it runs in a worker
+        # thread to keep the event loop serving other requests
+        ingestion_result = await asyncio.to_thread(ingest_documents_to_pinecone_and_bm25, base_filename)
+    invalidate_search_caches()
+    return ingestion_result
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown tasks."""
@@ -149,7 +182,8 @@ async def lifespan(app: FastAPI):
     ensure_directories_exist()
     logger.info("Application started, directories initialized")
     yield
-    # Shutdown: cleanup (if needed)
+    # Shutdown: close the server loop's async OpenAI client
+    await close_async_clients()
     logger.info("Application shutting down")
 
 
@@ -393,12 +427,14 @@ async def save_content_and_ingest(
         
         # Step 1: Save the content
         logger.info(f"Step 1: Saving content for {base_filename}")
-        saved_path = file_manager.save_file(PARSED_FILE_PATH, f"{base_filename}.md", content_update.content)
+        saved_path = await asyncio.to_thread(
+            file_manager.save_file, PARSED_FILE_PATH, f"{base_filename}.md", content_update.content
+        )
         logger.info(f"Content saved to {saved_path}")
         
         # Step 2: Ingest the document to Pinecone and BM25
         logger.info(f"Step 2: Ingesting documents for {base_filename}")
-        ingestion_result = ingest_documents_to_pinecone_and_bm25(base_filename)
+        ingestion_result = await run_ingestion(base_filename)
         logger.info(f"Ingestion completed for {base_filename}")
         
         return {
@@ -445,7 +481,7 @@ async def ingest_documents(filename: str = Path(..., description="Name of the fi
         base_filename = FilePath(filename).stem
         logger.info(f"Ingesting documents for base filename: {base_filename}")
         
-        ingestion_result = ingest_documents_to_pinecone_and_bm25(base_filename)
+        ingestion_result = await run_ingestion(base_filename)
         return {"message": ingestion_result.get("message", f"Documents successfully processed for {base_filename}")}
     except FileNotFoundError as e:
         logger.error(f"File not found for ingestion: {e}")
@@ -479,6 +515,7 @@ async def ingest_documents(filename: str = Path(..., description="Name of the fi
 @app.post(
     "/hybridsearch/",
     tags=["Search & Query"],
+    response_class=SEARCH_RESPONSE_CLASS,
     summary="Intelligent hybrid search across documents and data",
     description=HYBRID_SEARCH_DESCRIPTION
 )
@@ -497,7 +534,7 @@ async def hybrid_search(search_query: SearchQuery):
         target_excel_csv_files = search_strategy_info["target_excel_csv_files"]
         
         # Execute document search
-        document_result, document_error = execute_document_search(search_query.query, search_query.source_document, search_query.debug)
+        document_result, document_error = await execute_document_search(search_query.query, search_query.source_document, search_query.debug)
         
         # Determine search behavior based on strategy
         if search_strategy_info["strategy"] == "sequential":
@@ -552,6 +589,25 @@ async def hybrid_search(search_query: SearchQuery):
         )
 
 
+@app.post(
+    "/hybridsearch/stream/",
+    tags=["Search & Query"],
+    summary="Hybrid search with streamed answer tokens"
+)
+async def hybrid_search_stream(search_query: SearchQuery):
+    """Stream the hybrid search answer as plain text while the LLM generates it."""
+    logger.info(f"Performing streaming search for: {search_query.query}")
+    
+    # Convert "all" to None for the hybrid search function
+    source_document = search_query.source_document
+    search_filter = None if (source_document and source_document.lower() in ["all", "none", ""]) else source_document
+    
+    return StreamingResponse(
+        astream_hybrid_chain(search_query.query, search_filter),
+        media_type="text/plain"
+    )
+
+
 @app.post(
     "/querypandas/",
     tags=["Search & Query"],
@@ -696,17 +752,14 @@ async def get_source_documents():
         source_documents = []
         
         # Add parsed files (find original filenames with extensions)
+        uploaded_files_by_stem = map_files_by_stem(uploaded_files)
         for parsed_file in parsed_files:
             if parsed_file.endswith('.md'):
                 # Remove .md extension to get base name
                 base_name = parsed_file[:-3]
                 
                 # Find the corresponding original file in uploaded_files
-                original_file = None
-                for uploaded_file in uploaded_files:
-                    if FilePath(uploaded_file).stem == base_name:
-                        original_file = uploaded_file
-                        break
+                original_file = uploaded_files_by_stem.get(base_name)
                 
                 # Use original filename if found, otherwise use base name
                 if original_file:
@@ -1010,7 +1063,7 @@ def determine_search_strategy(source_document: str, uploaded_files: list) -> dic
             "description": "Sequential search strategy (all documents)"
         }
 
-def execute_document_search(query: str, source_document: str, debug: bool) -> tuple:
+async def execute_document_search(query: str, source_document: str, debug: bool) -> tuple:
     """
     Execute document search using hybrid search.
     
@@ -1029,10 +1082,9 @@ def execute_document_search(query: str, source_document: str, debug: bool) -> tu
         search_filter = None if (source_document and source_document.lower() in ["all", "none", ""]) else source_document
         
         if debug:
-            from hybrid_search import search_with_debug_info
-            result = search_with_debug_info(query, search_filter)
+            result = await asearch_with_debug_info(query, search_filter)
         else:
-            result = execure_hybrid_chain(query, search_filter)
+            result = await aexecute_hybrid_chain(query, search_filter)
             
         logger.info("✅ DOCUMENT SEARCH COMPLETED")
         return result, None
@@ -0,0 +1,268 @@
+"""
+In-process caching helpers shared by the search and ingestion modules.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def quantize_int8(vector: Sequence[float]) -> Tuple[np.ndarray, float]:
+    """
+    Quantize a float vector to int8 with a symmetric per-vector scale.
+
+    Args:
+        vector: The vector to quantize
+
+    Returns:
+        Tuple of (int8 array, scale) where vector ≈ int8 array * scale
+    """
+    embedding = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.max(np.abs(embedding))) if embedding.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    quantized = np.clip(np.round(embedding / scale), -127, 127).astype(np.int8)
+    return quantized, scale
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time-to-live.
+    Used for short-lived memoization of expensive remote calls.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+            ttl: Seconds an entry stays valid after it is stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or an expired entry
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache of query embeddings stored as int8 with a per-vector scale.
+    Quantizing cuts the memory of each cached vector to a quarter of float32;
+    vectors are dequantized to float32 on read because Pinecone needs floats.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of embeddings kept before evicting the least recently used
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+
+    @staticmethod
+    def quantize(vector: Sequence[float]) -> Tuple[np.ndarray, float]:
+        """
+        Quantize a float vector to int8 with a symmetric per-vector scale.
+
+        Args:
+            vector: The embedding to quantize
+
+        Returns:
+            Tuple of (int8 array, scale)
+        """
+        return quantize_int8(vector)
+
+    @staticmethod
+    def dequantize(quantized: np.ndarray, scale: float) -> List[float]:
+        """
+        Restore a float embedding from its int8 representation.
+
+        Args:
+            quantized: The int8 array
+            scale: The per-vector scale used during quantization
+
+        Returns:
+            The approximate float embedding as a list
+        """
+        return (quantized.astype(np.float32) * scale).tolist()
+
+    def get(self, key: Hashable) -> Optional[List[float]]:
+        """
+        Get a cached embedding.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The dequantized embedding, or None on a miss
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        return self.dequantize(*entry)
+
+    def set(self, key: Hashable, vector: Sequence[float]) -> None:
+        """
+        Quantize and store an embedding.
+
+        Args:
+            key: Cache key
+            vector: The float embedding
+        """
+        self._cache.set(key, self.quantize(vector))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class SemanticResponseCache:
+    """
+    Cache of final answers keyed by query embedding.
+    A lookup returns the cached answer of the most similar previous query when
+    its cosine similarity reaches the threshold, so near-duplicate questions
+    skip retrieval and generation. Entries expire after a TTL and the least
+    recently used entry is evicted when the cache is full.
+    Cached unit vectors are stored as int8 with a per-vector scale and compared
+    with exact int32 dot products, a quarter of the memory of float32 storage.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0, threshold: float = 0.97):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached answers
+            ttl: Seconds an answer stays valid after it is stored
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._vectors: Optional[np.ndarray] = None  # (maxsize, dim) int8 unit vectors, allocated on first add
+        self._scales = np.zeros(maxsize, dtype=np.float32)
+        self._expires_at = np.zeros(maxsize, dtype=np.float64)
+        self._last_used = np.zeros(maxsize, dtype=np.float64)
+        self._namespaces: List[Optional[Hashable]] = [None] * maxsize
+        self._answers: List[Optional[str]] = [None] * maxsize
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        """Return the vector as a float32 unit vector."""
+        embedding = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(embedding))
+        return embedding / norm if norm > 0 else embedding
+
+    def lookup(self, vector: Sequence[float], namespace: Hashable = None) -> Optional[str]:
+        """
+        Find a cached answer for a similar query.
+
+        Args:
+            vector: Embedding of the new query
+            namespace: Only entries stored under the same namespace can match (e.g. the source filter)
+
+        Returns:
+            The cached answer, or None when no live entry is similar enough
+        """
+        with self._lock:
+            if self._vectors is None:
+                return None
+            now = time.monotonic()
+            live = self._expires_at > now
+            live &= np.fromiter((ns == namespace for ns in self._namespaces), dtype=bool, count=self.maxsize)
+            if not live.any():
+                return None
+            query, query_scale = quantize_int8(self._normalize(vector))
+            dots = np.einsum('ij,j->i', self._vectors, query, dtype=np.int32)
+            similarities = dots * (self._scales * query_scale)
+            similarities[~live] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            self._last_used[best] = now
+            return self._answers[best]
+
+    def add(self, vector: Sequence[float], answer: str, namespace: Hashable = None) -> None:
+        """
+        Store an answer for a query embedding.
+
+        Args:
+            vector: Embedding of the query
+            answer: Final answer to cache
+            namespace: Namespace the entry belongs to (e.g. the source filter)
+        """
+        embedding, scale = quantize_int8(self._normalize(vector))
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != embedding.shape[0]:
+                self._vectors = np.zeros((self.maxsize, embedding.shape[0]), dtype=np.int8)
+                self._expires_at[:] = 0.0
+            now = time.monotonic()
+            # Reuse an expired slot if there is one, otherwise evict the least recently used
+            expired = np.flatnonzero(self._expires_at <= now)
+            slot = int(expired[0]) if expired.size else int(np.argmin(self._last_used))
+            self._vectors[slot] = embedding
+            self._scales[slot] = scale
+            self._expires_at[slot] = now + self.ttl
+            self._last_used[slot] = now
+            self._namespaces[slot] = namespace
+            self._answers[slot] = answer
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._expires_at[:] = 0.0
+            self._namespaces = [None] * self.maxsize
+            self._answers = [None] * self.maxsize
@@ -6,7 +6,7 @@ This replaces local filesystem storage with cloud storage buckets.
 import os
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
 import logging
@@ -103,10 +103,11 @@ class CloudStorageManager:
         bucket = self.client.bucket(bucket_name)
         blob = bucket.blob(filename)
         
-        if not blob.exists():
+        # Download directly and map a 404 instead of checking exists() first, saving a round trip
+        try:
+            return blob.download_as_bytes()
+        except NotFound:
             raise FileNotFoundError(f"File {filename} not found in {directory}")
-        
-        return blob.download_as_bytes()
     
     def download_file_to_temp(self, directory: str, filename: str) -> str:
         """
@@ -158,12 +159,13 @@ class CloudStorageManager:
         content = self.download_file(directory, filename)
         return content.decode('utf-8')
     
-    def list_files(self, directory: str) -> List[str]:
+    def list_files(self, directory: str, suffix: Optional[str] = None) -> List[str]:
         """
         List all files in a directory.
         
         Args:
             directory: Directory type
+            suffix: Optional filename suffix (e.g. ".json"); filtered server-side
             
         Returns:
             List of filenames
@@ -174,9 +176,36 @@ class CloudStorageManager:
         bucket_name = self.buckets[directory]
         bucket = self.client.bucket(bucket_name)
         
-        blobs = bucket.list_blobs()
+        blobs = self._list_blobs(bucket, suffix)
         return [blob.name for blob in blobs]
     
+    def list_files_with_mtime(self, directory: str, suffix: Optional[str] = None) -> Dict[str, float]:
+        """
+        List all files in a directory with their last-modified timestamps.
+        
+        Args:
+            directory: Directory type
+            suffix: Optional filename suffix (e.g. ".json"); filtered server-side
+            
+        Returns:
+            Dictionary mapping filename to modification time (POSIX seconds)
+        """
+        if directory not in self.buckets:
+            raise ValueError(f"Invalid directory: {directory}")
+        
+        bucket_name = self.buckets[directory]
+        bucket = self.client.bucket(bucket_name)
+        
+        blobs = self._list_blobs(bucket, suffix)
+        return {blob.name: blob.updated.timestamp() if blob.updated else 0.0 for blob in blobs}
+    
+    @staticmethod
+    def _list_blobs(bucket, suffix: Optional[str] = None):
+        """List blobs in a bucket, letting Cloud Storage apply the suffix filter."""
+        if suffix:
+            return bucket.list_blobs(match_glob=f"**{suffix}")
+        return bucket.list_blobs()
+    
     def file_exists(self, directory: str, filename: str) -> bool:
         """
         Check if a file exists.
@@ -13,14 +13,45 @@ BM25_INDEXES_PATH = "bm25_indexes"
 # Pinecone Configuration - Generic and configurable
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "biz-to-bricks-vector-store")
 PINECONE_NAMESPACE = os.getenv("PINECONE_NAMESPACE", "document-namespace")
+PINECONE_UPSERT_CONCURRENCY = int(os.getenv("PINECONE_UPSERT_CONCURRENCY", "10"))  # Upsert batches in flight per ingest (Pinecone suggests up to 30)
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "8"))  # Documents ingested at once by the API; more requests wait their turn
 
 # LLM Configuration
 LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "gpt-4.1-mini")
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL")  # Optional OpenAI-compatible endpoint, e.g. a vLLM server with --enable-prefix-caching
+LLM_CACHE_TYPE = os.getenv("LLM_CACHE_TYPE", "memory")  # memory, sqlite or none
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".langchain_cache.db")  # Used when LLM_CACHE_TYPE=sqlite
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))  # Max cached responses when LLM_CACHE_TYPE=memory
+# Max concurrent OpenAI requests (LLM and embeddings); defaults to the limit for OPENAI_USAGE_TIER
+OPENAI_TIER_CONCURRENCY = {"free": 1, "tier1": 35, "tier2": 60}
+OPENAI_USAGE_TIER = os.getenv("OPENAI_USAGE_TIER", "tier1").lower()
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", OPENAI_TIER_CONCURRENCY.get(OPENAI_USAGE_TIER, 35)))
 
 # Embedding Configuration
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "text-embedding-3-large")
 EMBEDDING_DIMENSION = os.getenv("EMBEDDING_DIMENSION", "3072")  # OpenAI text-embedding-3-large dimension
+# text-embedding-3 models can return shortened vectors (e.g. EMBEDDING_MODEL_NAME=text-embedding-3-small with
+# EMBEDDING_DIMENSION=1024), which shrinks upload size and index storage; the Pinecone index must match
+EMBEDDING_REQUEST_DIMENSIONS = int(EMBEDDING_DIMENSION) if EMBEDDING_MODEL_NAME.startswith("text-embedding-3") else None
+
+# Search cache configuration
+FILTERED_DOCS_CACHE_SIZE = int(os.getenv("FILTERED_DOCS_CACHE_SIZE", "256"))  # Max cached (query, source) retrievals
+FILTERED_DOCS_CACHE_TTL = float(os.getenv("FILTERED_DOCS_CACHE_TTL", "60"))  # Seconds a cached retrieval stays valid
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))  # Max cached query embeddings (int8)
+# Off by default: a hit returns the stored answer of a different, near-identical question
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in ("true", "1", "yes")
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))  # Max cached answers
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))  # Seconds a cached answer stays valid
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))  # Min cosine similarity for a hit
+
+# Search strategy configuration
+# Start the pandas agent fallback alongside semantic search for "all" sources.
+# Hides fallback latency but spends pandas agent tokens even when semantic search answers:
+# a file whose agent has already started runs to completion after its result is discarded.
+# At most SPECULATIVE_PANDAS_MAX_SEARCHES run at once; searches beyond that do not speculate.
+SPECULATIVE_PANDAS_SEARCH = os.getenv("SPECULATIVE_PANDAS_SEARCH", "false").lower() in ("true", "1", "yes")
+SPECULATIVE_PANDAS_MAX_SEARCHES = int(os.getenv("SPECULATIVE_PANDAS_MAX_SEARCHES", "2"))
 
 # API Configuration
 API_TITLE = "Document Processing API"
@@ -6,8 +6,9 @@ This provides a seamless transition between local development and cloud deployme
 import os
 import logging
 import tempfile
+import threading
 from pathlib import Path as FilePath
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from langchain_community.document_loaders import UnstructuredMarkdownLoader
 from langchain_core.documents import Document
 
@@ -66,6 +67,12 @@ class FileManager:
             self.use_cloud_storage = self._should_use_cloud_storage()
             logger.info("🔧 Storage mode: AUTO-DETECT")
         
+        # {stem: filename} index of uploaded_files, built on first lookup and dropped
+        # whenever this manager writes or deletes an uploaded file
+        self._uploaded_by_stem: Optional[Dict[str, str]] = None
+        self._stem_index_generation = 0  # Bumped on every invalidation
+        self._stem_index_lock = threading.Lock()
+        
         self.storage_manager = None
         if self.use_cloud_storage:
             if not CLOUD_STORAGE_AVAILABLE:
@@ -128,13 +135,14 @@ class FileManager:
             File path or Cloud Storage URI
         """
         if self.use_cloud_storage:
-            return self.storage_manager.save_file(directory, filename, content)
+            saved_path = self.storage_manager.save_file(directory, filename, content)
         else:
-            file_path = os.path.join(directory, filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
+            saved_path = os.path.join(directory, filename)
+            with open(saved_path, 'w', encoding='utf-8') as f:
                 f.write(content)
-            logger.info(f"File saved locally: {file_path}")
-            return file_path
+            logger.info(f"File saved locally: {saved_path}")
+        self._invalidate_stem_index(directory)
+        return saved_path
     
     def save_binary_file(self, directory: str, filename: str, content: bytes) -> str:
         """
@@ -149,13 +157,14 @@ class FileManager:
             File path or Cloud Storage URI
         """
         if self.use_cloud_storage:
-            return self.storage_manager.upload_file(directory, filename, content)
+            saved_path = self.storage_manager.upload_file(directory, filename, content)
         else:
-            file_path = os.path.join(directory, filename)
-            with open(file_path, 'wb') as f:
+            saved_path = os.path.join(directory, filename)
+            with open(saved_path, 'wb') as f:
                 f.write(content)
-            logger.info(f"Binary file saved locally: {file_path}")
-            return file_path
+            logger.info(f"Binary file saved locally: {saved_path}")
+        self._invalidate_stem_index(directory)
+        return saved_path
     
     def load_file(self, directory: str, filename: str) -> str:
         """
@@ -209,27 +218,54 @@ class FileManager:
         else:
             return os.path.join(directory, filename)
     
-    def list_files(self, directory: str) -> List[str]:
+    def list_files(self, directory: str, suffix: Optional[str] = None) -> List[str]:
         """
         List all files in a directory.
         
         Args:
             directory: Directory type
+            suffix: Optional filename suffix (e.g. ".json") to filter by
             
         Returns:
             List of filenames
         """
         if self.use_cloud_storage:
-            return self.storage_manager.list_files(directory)
+            return self.storage_manager.list_files(directory, suffix=suffix)
         else:
             try:
                 if os.path.exists(directory):
+                    if suffix:
+                        return [name for name in os.listdir(directory) if name.endswith(suffix)]
                     return os.listdir(directory)
                 return []
             except Exception as e:
                 logger.error(f"Failed to list files in {directory}: {e}")
                 return []
     
+    def list_files_with_mtime(self, directory: str, suffix: Optional[str] = None) -> Dict[str, float]:
+        """
+        List all files in a directory with their last-modified timestamps.
+        
+        Args:
+            directory: Directory type
+            suffix: Optional filename suffix (e.g. ".json") to filter by
+            
+        Returns:
+            Dictionary mapping filename to modification time (POSIX seconds)
+        """
+        if self.use_cloud_storage:
+            return self.storage_manager.list_files_with_mtime(directory, suffix=suffix)
+        else:
+            try:
+                if os.path.exists(directory):
+                    return {name: os.path.getmtime(os.path.join(directory, name)) 
+                            for name in os.listdir(directory)
+                            if not suffix or name.endswith(suffix)}
+                return {}
+            except Exception as e:
+                logger.error(f"Failed to list files in {directory}: {e}")
+                return {}
+    
     def file_exists(self, directory: str, filename: str) -> bool:
         """
         Check if a file exists.
@@ -259,14 +295,49 @@ class FileManager:
             True if file was deleted, False if it didn't exist
         """
         if self.use_cloud_storage:
-            return self.storage_manager.delete_file(directory, filename)
+            deleted = self.storage_manager.delete_file(directory, filename)
         else:
             file_path = os.path.join(directory, filename)
-            if os.path.exists(file_path):
+            deleted = os.path.exists(file_path)
+            if deleted:
                 os.remove(file_path)
                 logger.info(f"File deleted: {file_path}")
-                return True
-            return False
+        self._invalidate_stem_index(directory)
+        return deleted
+    
+    def _invalidate_stem_index(self, directory: str):
+        """
+        Drop the uploaded_files stem index when that directory changes.
+        Called after the write or delete completes; the generation bump stops a rebuild
+        that listed the directory before the change from caching its stale result.
+        """
+        if directory == UPLOADED_FILES_DIR:
+            with self._stem_index_lock:
+                self._stem_index_generation += 1
+                self._uploaded_by_stem = None
+    
+    def resolve_by_stem(self, base_filename: str) -> Optional[str]:
+        """
+        Find the uploaded file with the given stem without listing uploaded_files on every call.
+        A miss re-lists the directory once, since another server instance may have uploaded it.
+        
+        Args:
+            base_filename: Filename without extension
+            
+        Returns:
+            The uploaded filename, or None if no uploaded file has that stem
+        """
+        files_by_stem = self._uploaded_by_stem
+        if files_by_stem is not None and base_filename in files_by_stem:
+            return files_by_stem[base_filename]
+        generation = self._stem_index_generation
+        files_by_stem = map_files_by_stem(self.list_files(UPLOADED_FILES_DIR))
+        with self._stem_index_lock:
+            # A write that finished during the listing may be missing from it; keep
+            # the result for this lookup only
+            if generation == self._stem_index_generation:
+                self._uploaded_by_stem = files_by_stem
+        return files_by_stem.get(base_filename)
     
     def load_markdown_file(self, directory: str, filename: str) -> Tuple[str, dict]:
         """
@@ -327,13 +398,17 @@ class FileManager:
             FileNotFoundError: If parsed file doesn't exist
         """
         # Ensure filename has .md extension
-        base_name = filename.split(".")[0] if "." in filename else filename
+        base_name = file_stem(filename)
         md_filename = f"{base_name}.md"
         
-        # Load from parsed files (where edited content is now stored)
-        if self.file_exists(PARSED_FILES_DIR, md_filename):
+        # Load from parsed files (where edited content is now stored).
+        # Cloud downloads report a missing file themselves, so only local storage checks first.
+        if self.use_cloud_storage or self.file_exists(PARSED_FILES_DIR, md_filename):
             logger.info(f"Loading parsed file: {md_filename}")
-            return self.load_markdown_file(PARSED_FILES_DIR, md_filename)
+            try:
+                return self.load_markdown_file(PARSED_FILES_DIR, md_filename)
+            except FileNotFoundError:
+                pass
         
         # File doesn't exist
         raise FileNotFoundError(
@@ -395,9 +470,9 @@ def create_directory(directory: str) -> str:
     return directory
 
 
-def list_files(directory: str) -> List[str]:
-    """List all files in the given directory."""
-    return get_file_manager().list_files(directory)
+def list_files(directory: str, suffix: Optional[str] = None) -> List[str]:
+    """List all files in the given directory, optionally only those ending with suffix."""
+    return get_file_manager().list_files(directory, suffix=suffix)
 
 
 def read_file(file_path: str) -> str:
@@ -422,9 +497,40 @@ def load_markdown_file(file_path: str) -> Tuple[str, dict]:
     return text, metadata
 
 
+# Extensions of uploaded, parsed and index files; any other dot is part of the name
+KNOWN_FILE_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt', '.md', '.xlsx', '.xls', '.csv', '.json'}
+
+
+def file_stem(filename: str) -> str:
+    """
+    Strip a known file extension from a filename.
+    Dots inside the name are kept ("report.v2.pdf" -> "report.v2"), and a name
+    that has no known extension is returned unchanged ("report.v2" -> "report.v2").
+    """
+    path = FilePath(filename)
+    return path.stem if path.suffix.lower() in KNOWN_FILE_EXTENSIONS else filename
+
+
+def map_files_by_stem(filenames: List[str]) -> Dict[str, str]:
+    """
+    Index filenames by their stem for constant-time lookup of a file from its base name.
+    When several files share a stem, the first one listed wins.
+    
+    Args:
+        filenames: Filenames with extensions (e.g. a listing of uploaded_files)
+        
+    Returns:
+        Dictionary mapping file_stem(filename) to filename
+    """
+    files_by_stem = {}
+    for filename in filenames:
+        files_by_stem.setdefault(file_stem(filename), filename)
+    return files_by_stem
+
+
 def get_file_path(directory: str, filename: str, extension: Optional[str] = None) -> str:
     """Construct file path with proper handling."""
-    base_name = filename.split(".")[0] if "." in filename else filename
+    base_name = file_stem(filename)
     if extension:
         return str(FilePath(directory) / f"{base_name}{extension}")
     return str(FilePath(directory) / filename)
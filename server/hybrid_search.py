@@ -4,19 +4,41 @@ import time
 import json
 import numpy as np
 from langchain_community.retrievers import PineconeHybridSearchRetriever
+from pinecone_text.hybrid import hybrid_convex_scale
 from langchain.chat_models import init_chat_model
 from langchain_openai import OpenAIEmbeddings
 from pinecone_text.sparse import BM25Encoder
 from langchain import hub
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.embeddings import Embeddings
+from langchain_core.documents import Document
+from langchain_core.caches import InMemoryCache
 from pinecone_util import create_index
 from langchain.prompts import ChatPromptTemplate
 from file_util_enhanced import get_file_manager
-import tempfile
 import logging
-from typing import List, Dict, Any, Optional
+import hashlib
+import gzip
+import io
+import re
+from operator import itemgetter, methodcaller
+from concurrent.futures import ThreadPoolExecutor, Future
+import asyncio
+import atexit
+import contextlib
+import threading
+import weakref
+import httpx
+from typing import List, Dict, Any, Optional, Sequence, AsyncIterator, Tuple, Union
 from excel_agent import create_excel_agent
+from cache_util import TTLCache, QueryEmbeddingCache, SemanticResponseCache
+
+# orjson is an optional, faster JSON parser; fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +56,12 @@ if openai_api_key:
     openai_api_key = openai_api_key.strip("\"'")
 
 # Import configuration constants
-from config import PINECONE_NAMESPACE, BM25_INDEXES_PATH, LLM_MODEL_NAME, LLM_PROVIDER, EMBEDDING_MODEL_NAME
+from config import (PINECONE_NAMESPACE, BM25_INDEXES_PATH, LLM_MODEL_NAME, LLM_PROVIDER, EMBEDDING_MODEL_NAME,
+                    EMBEDDING_REQUEST_DIMENSIONS,
+                    LLM_CACHE_TYPE, LLM_CACHE_PATH, LLM_CACHE_SIZE, FILTERED_DOCS_CACHE_SIZE, FILTERED_DOCS_CACHE_TTL,
+                    QUERY_EMBEDDING_CACHE_SIZE, SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_SIZE,
+                    SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_THRESHOLD, SPECULATIVE_PANDAS_SEARCH, SPECULATIVE_PANDAS_MAX_SEARCHES,
+                    OPENAI_MAX_CONCURRENCY, LLM_BASE_URL)
 
 # Initialize file manager
 file_manager = get_file_manager()
@@ -42,6 +69,12 @@ file_manager = get_file_manager()
 # Lazy initialization of LLM and embeddings to avoid startup failures
 _llm = None
 _embeddings = None
+_embeddings_lock = threading.Lock()
+_http_client = None
+_http_client_lock = threading.Lock()
+
+# Keep-alive connections held open to the OpenAI API
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
 
 def is_excel_or_csv_file(filename: str) -> bool:
     """
@@ -60,6 +93,24 @@ def is_excel_or_csv_file(filename: str) -> bool:
     extension = filename.lower().split('.')[-1] if '.' in filename else ''
     return extension in ['xlsx', 'xls', 'csv']
 
+# Common "no answer" patterns in LLM responses
+NO_ANSWER_PATTERNS = (
+    "no relevant documents found",
+    "no information available",
+    "not available in the context",
+    "cannot find",
+    "don't have information",
+    "no answer",
+    "information is not available",
+    "not provided in the context",
+    "i cannot answer",
+    "not mentioned in the context"
+)
+
+# All patterns compiled once into a single case-insensitive alternation so a result
+# is scanned in one pass without making a lowercased copy first
+_NO_ANSWER_RE = re.compile("|".join(map(re.escape, NO_ANSWER_PATTERNS)), re.IGNORECASE)
+
 def is_meaningful_semantic_result(result: str) -> bool:
     """
     Determine if a semantic search result contains meaningful information.
@@ -74,41 +125,109 @@ def is_meaningful_semantic_result(result: str) -> bool:
         return False
     
     # Clean up the result for analysis
-    cleaned_result = result.strip().lower()
-    
-    # Check for common "no answer" patterns
-    no_answer_patterns = [
-        "no relevant documents found",
-        "no information available",
-        "not available in the context",
-        "cannot find",
-        "don't have information",
-        "no answer",
-        "information is not available",
-        "not provided in the context",
-        "i cannot answer",
-        "not mentioned in the context"
-    ]
-    
-    # If any no-answer pattern is found, consider it not meaningful
-    for pattern in no_answer_patterns:
-        if pattern in cleaned_result:
-            return False
+    cleaned_result = result.strip()
     
-    # Check if result is too short (likely not meaningful)
+    # Check if result is too short (likely not meaningful) before scanning it
     if len(cleaned_result) < 20:
         return False
     
+    # If any no-answer pattern is found, consider it not meaningful
+    if _NO_ANSWER_RE.search(cleaned_result):
+        return False
+    
     # If we get here, assume it's meaningful
     return True
 
-def execute_pandas_agent_search(query: str, source_document: str = None) -> str:
+# Bound concurrent OpenAI requests so bursts queue locally instead of tripping
+# rate limits and falling into retry backoff. Worker threads and event loops share
+# one process-wide semaphore, so the limit holds however many loops are running.
+_openai_thread_semaphore = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+# Threads that block on the semaphore for async callers; waiters beyond this queue in the executor
+_openai_slot_executor = ThreadPoolExecutor(max_workers=OPENAI_MAX_CONCURRENCY, thread_name_prefix="openai-slot")
+
+@contextlib.asynccontextmanager
+async def openai_request_slot():
+    """
+    Hold one of the process-wide OpenAI request slots from async code.
+    A free slot is taken without leaving the event loop; otherwise the wait runs in
+    a worker thread. If the waiting task is cancelled, the slot is handed back as
+    soon as the worker gets it.
+    """
+    if not _openai_thread_semaphore.acquire(blocking=False):
+        state_lock = threading.Lock()
+        state = {"acquired": False, "abandoned": False}
+        
+        def acquire():
+            _openai_thread_semaphore.acquire()
+            with state_lock:
+                if state["abandoned"]:
+                    _openai_thread_semaphore.release()
+                else:
+                    state["acquired"] = True
+        
+        try:
+            await asyncio.get_running_loop().run_in_executor(_openai_slot_executor, acquire)
+        except BaseException:
+            with state_lock:
+                state["abandoned"] = True
+                if state["acquired"]:
+                    _openai_thread_semaphore.release()
+            raise
+    try:
+        yield
+    finally:
+        _openai_thread_semaphore.release()
+
+PANDAS_SEARCH_MAX_WORKERS = 8  # Cap on concurrent Excel/CSV agents to stay within OpenAI rate limits
+
+def _search_excel_file(file_name: str, query: str, directory: str,
+                       cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Query a single Excel/CSV file with its own pandas agent.
+    
+    Args:
+        file_name: Name of the Excel/CSV file
+        query: The search query
+        directory: Directory the file was uploaded to
+        cancel_event: Optional event that, once set, stops the agent from being started
+        
+    Returns:
+        Formatted result, an error message, or None if the file had no answer
+    """
+    try:
+        # Get full file path
+        file_path = file_manager.get_file_path(directory, file_name)
+        
+        logger.info("Searching in file: %s", file_name)
+        
+        # Create excel agent and query
+        with create_excel_agent(file_path) as agent, _openai_thread_semaphore:
+            # An agent cannot be stopped once it runs, so a cancelled search skips it entirely
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info("Skipping %s, the search was cancelled", file_name)
+                return None
+            result = agent.query(query)
+            if result and result.strip():
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Got result from %s: %s...", file_name, result[:100])
+                return f"From {file_name}:\n{result}"
+            logger.info("No result from %s", file_name)
+            return None
+            
+    except Exception as file_error:
+        error_msg = f"Error searching {file_name}: {str(file_error)}"
+        logger.error(error_msg)
+        return error_msg
+
+def execute_pandas_agent_search(query: str, source_document: str = None,
+                                cancel_event: Optional[threading.Event] = None) -> str:
     """
     Execute search using pandas agent for Excel/CSV files.
     
     Args:
         query: The search query
         source_document: Optional specific Excel/CSV file to search, or None to search all
+        cancel_event: Optional event that, once set, stops agents that have not started yet
         
     Returns:
         Search result as string
@@ -134,28 +253,14 @@ def execute_pandas_agent_search(query: str, source_document: str = None) -> str:
         
         logger.info(f"Found {len(excel_csv_files)} Excel/CSV files to search: {excel_csv_files}")
         
-        # Try to search each file and collect results
-        results = []
-        for file_name in excel_csv_files:
-            try:
-                # Get full file path
-                file_path = file_manager.get_file_path(UPLOADED_FILE_PATH, file_name)
-                
-                logger.info(f"Searching in file: {file_name}")
-                
-                # Create excel agent and query
-                with create_excel_agent(file_path) as agent:
-                    result = agent.query(query)
-                    if result and result.strip():
-                        results.append(f"From {file_name}:\n{result}")
-                        logger.info(f"Got result from {file_name}: {result[:100]}...")
-                    else:
-                        logger.info(f"No result from {file_name}")
-                        
-            except Exception as file_error:
-                error_msg = f"Error searching {file_name}: {str(file_error)}"
-                logger.error(error_msg)
-                results.append(error_msg)
+        # Search the files concurrently; map() keeps results in file order
+        max_workers = min(PANDAS_SEARCH_MAX_WORKERS, len(excel_csv_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_results = executor.map(
+                lambda file_name: _search_excel_file(file_name, query, UPLOADED_FILE_PATH, cancel_event),
+                excel_csv_files
+            )
+            results = [result for result in file_results if result]
         
         # Combine results
         if results:
@@ -170,78 +275,418 @@ def execute_pandas_agent_search(query: str, source_document: str = None) -> str:
         logger.error(error_msg)
         return error_msg
 
+# Speculative pandas searches run on their own workers; a search only speculates when one
+# is free, and otherwise runs the fallback only when needed
+_speculative_pandas_slots = threading.BoundedSemaphore(SPECULATIVE_PANDAS_MAX_SEARCHES)
+_speculative_pandas_executor = ThreadPoolExecutor(max_workers=SPECULATIVE_PANDAS_MAX_SEARCHES,
+                                                  thread_name_prefix="speculative-pandas")
+
+def _run_speculative_pandas_search(query: str, cancel_event: threading.Event) -> str:
+    """Run a speculative pandas agent search, then free its speculation slot."""
+    try:
+        return execute_pandas_agent_search(query, cancel_event=cancel_event)
+    finally:
+        _speculative_pandas_slots.release()
+
+def create_llm_cache():
+    """
+    Create the LangChain LLM response cache selected by LLM_CACHE_TYPE, for the search model only.
+    LangChain keys cached responses on the rendered prompt and the model
+    configuration, so repeated questions over the same context skip the LLM call.
+    The cache is attached to the search model rather than installed globally, so
+    question, FAQ and summary generation still get fresh output on every call.
+    The in-memory cache keeps at most LLM_CACHE_SIZE responses.
+    
+    Returns:
+        The cache, or False if caching is disabled or the cache could not be created
+    """
+    cache_type = LLM_CACHE_TYPE.lower()
+    if cache_type == "none":
+        logger.info("LLM response cache disabled")
+        return False
+    
+    try:
+        if cache_type == "sqlite":
+            from langchain_community.cache import SQLiteCache
+            logger.info(f"Using SQLite LLM response cache at {LLM_CACHE_PATH}")
+            return SQLiteCache(database_path=LLM_CACHE_PATH)
+        logger.info(f"Using in-memory LLM response cache (max {LLM_CACHE_SIZE} responses)")
+        return InMemoryCache(maxsize=LLM_CACHE_SIZE)
+    except Exception as e:
+        # A broken cache should never take down search
+        logger.warning(f"Failed to configure LLM response cache: {e}")
+        return False
+
 def get_llm():
     """Get the LLM instance with lazy initialization."""
     global _llm
     if _llm is None:
         try:
+            # LLM_BASE_URL points at an OpenAI-compatible server such as vLLM
+            base_url_kwargs = {"base_url": LLM_BASE_URL} if LLM_BASE_URL else {}
             _llm = init_chat_model(LLM_MODEL_NAME, 
                                   model_provider=LLM_PROVIDER,
-                                  api_key=openai_api_key)
+                                  api_key=openai_api_key,
+                                  cache=create_llm_cache(),
+                                  **base_url_kwargs)
             logger.info("LLM initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}")
             raise
     return _llm
 
+def _close_http_client():
+    """Close the shared OpenAI HTTP client at interpreter exit."""
+    if _http_client is not None:
+        _http_client.close()
+
+def _new_http_limits() -> httpx.Limits:
+    """Connection pool limits for OpenAI HTTP clients."""
+    return httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS)
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared sync HTTP client used for OpenAI calls, with lazy, thread-safe initialization.
+    Reusing one keep-alive pool per process avoids a TCP/TLS handshake per query.
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(limits=_new_http_limits())
+                atexit.register(_close_http_client)
+    return _http_client
+
 def get_embeddings():
-    """Get the embeddings instance with lazy initialization."""
+    """Get the embeddings instance for sync calls with lazy, thread-safe initialization."""
     global _embeddings
     if _embeddings is None:
-        try:
-            _embeddings = OpenAIEmbeddings(api_key=openai_api_key, 
-                                          model=EMBEDDING_MODEL_NAME)
-            logger.info("Embeddings initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize embeddings: {e}")
-            raise
+        with _embeddings_lock:
+            if _embeddings is None:
+                try:
+                    _embeddings = OpenAIEmbeddings(api_key=openai_api_key, 
+                                                  model=EMBEDDING_MODEL_NAME,
+                                                  dimensions=EMBEDDING_REQUEST_DIMENSIONS,
+                                                  http_client=get_http_client())
+                    logger.info("Embeddings initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize embeddings: {e}")
+                    raise
     return _embeddings
 
+# Async connections belong to the event loop that opened them, and the sync search entry
+# points run each search on a fresh loop, so every loop gets its own async client. Each
+# entry holds the embeddings and the httpx client it owns; close_async_clients() closes
+# the client before its loop shuts down.
+_async_embeddings: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[OpenAIEmbeddings, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+def get_async_embeddings():
+    """Get the embeddings instance for async calls on the running event loop."""
+    loop = asyncio.get_running_loop()
+    entry = _async_embeddings.get(loop)
+    if entry is None:
+        http_async_client = httpx.AsyncClient(limits=_new_http_limits())
+        embeddings = OpenAIEmbeddings(
+            api_key=openai_api_key,
+            model=EMBEDDING_MODEL_NAME,
+            dimensions=EMBEDDING_REQUEST_DIMENSIONS,
+            http_client=get_http_client(),
+            http_async_client=http_async_client)
+        entry = _async_embeddings[loop] = (embeddings, http_async_client)
+    return entry[0]
+
+async def close_async_clients():
+    """Close the running event loop's async OpenAI client, if it opened one."""
+    entry = _async_embeddings.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+def run_search(coroutine):
+    """
+    Run a search coroutine on a new event loop, closing that loop's async clients
+    before the loop shuts down so their connection pools are not leaked.
+    
+    Args:
+        coroutine: The search coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    async def run_and_close():
+        try:
+            return await coroutine
+        finally:
+            await close_async_clients()
+    return asyncio.run(run_and_close())
+
+# Query embeddings are cached as int8 to keep the cache small
+_query_embedding_cache = QueryEmbeddingCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+
+def get_query_embedding(query: str) -> List[float]:
+    """
+    Embed a search query, reusing a cached embedding for repeated queries.
+    
+    Args:
+        query: The search query
+        
+    Returns:
+        The query embedding
+    """
+    cache_key = (EMBEDDING_MODEL_NAME, query)
+    embedding = _query_embedding_cache.get(cache_key)
+    if embedding is None:
+        with _openai_thread_semaphore:
+            embedding = get_embeddings().embed_query(query)
+        _query_embedding_cache.set(cache_key, embedding)
+    return embedding
+
+async def aget_query_embedding(query: str) -> List[float]:
+    """
+    Async variant of get_query_embedding.
+    
+    Args:
+        query: The search query
+        
+    Returns:
+        The query embedding
+    """
+    cache_key = (EMBEDDING_MODEL_NAME, query)
+    embedding = _query_embedding_cache.get(cache_key)
+    if embedding is None:
+        async with openai_request_slot():
+            embedding = await get_async_embeddings().aembed_query(query)
+        _query_embedding_cache.set(cache_key, embedding)
+    return embedding
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Embeddings adapter that routes query embeddings through the shared query
+    embedding cache. Handing it to the hybrid retriever means a query that was
+    already embedded (e.g. for the semantic response cache) is not sent to
+    OpenAI a second time.
+    """
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return get_embeddings().embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await get_async_embeddings().aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return get_query_embedding(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await aget_query_embedding(text)
+
 # Constants for configuration
 BM25_ALPHA = 0.3  # Favor BM25 (sparse) for exact name matches
 TOP_K_RESULTS = 10  # Retrieve more documents for better coverage
 CHUNK_SIZE = 4000  # Text chunk size for processing
 CHUNK_OVERLAP = 200  # Overlap between chunks
+BM25_DOWNLOAD_WORKERS = 16  # Max concurrent BM25 index downloads
+
+# BM25 indexes are written gzip-compressed; plain JSON indexes from older ingests are still read
+BM25_INDEX_SUFFIXES = (".json", ".json.gz")
 
-def load_bm25_encoder_from_file(file_content: str, file_name: str) -> BM25Encoder:
+def list_bm25_index_files() -> Dict[str, float]:
+    """List BM25 index files (plain and gzip-compressed JSON) with their modification times."""
+    # One listing per suffix keeps the filter in storage, so sidecars and merged caches
+    # in the same directory are never transferred
+    file_mtimes = {}
+    for suffix in BM25_INDEX_SUFFIXES:
+        file_mtimes.update(file_manager.list_files_with_mtime(BM25_INDEXES_PATH, suffix=suffix))
+    return file_mtimes
+
+def load_bm25_encoder_from_file(file_content: Union[str, bytes], file_name: str) -> BM25Encoder:
     """
     Load a BM25 encoder from file content.
     
     Args:
-        file_content: JSON content of the encoder file
-        file_name: Name of the file for logging
+        file_content: JSON content of the encoder file, gzip-compressed if file_name ends in .gz
+        file_name: Name of the file, used to detect compression and for logging
         
     Returns:
         BM25Encoder: The loaded encoder
     """
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
-        
-        try:
-            # Load the JSON data and reconstruct the encoder
-            encoder_data = json.loads(file_content)
-            encoder = BM25Encoder()
-            encoder.doc_freq = encoder_data['doc_freq']
-            encoder.n_docs = encoder_data['n_docs']
-            encoder.avgdl = encoder_data['avgdl']
-            encoder.k1 = encoder_data['k1']
-            encoder.b = encoder_data['b']
-            logger.info(f"Successfully loaded encoder from {file_name}")
-            return encoder
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+        if file_name.endswith(".gz"):
+            file_content = gzip.decompress(file_content)
+        # Parse the JSON data in memory and reconstruct the encoder
+        encoder_data = orjson.loads(file_content) if orjson else json.loads(file_content)
+        encoder = BM25Encoder()
+        # JSON object keys are strings; BM25Encoder looks token hashes up as ints
+        doc_freq = encoder_data['doc_freq']
+        encoder.doc_freq = dict(zip(map(int, doc_freq.keys()), doc_freq.values()))
+        encoder.n_docs = encoder_data['n_docs']
+        encoder.avgdl = encoder_data['avgdl']
+        encoder.k1 = encoder_data['k1']
+        encoder.b = encoder_data['b']
+        logger.info(f"Successfully loaded encoder from {file_name}")
+        return encoder
             
     except Exception as e:
         logger.error(f"Error loading encoder from {file_name}: {e}")
         raise
 
-def create_bm25_encoder():
+def merge_bm25_encoders(encoders: Sequence[BM25Encoder]) -> BM25Encoder:
+    """
+    Merge fitted BM25 encoders into one encoder over their combined corpora.
+    Document frequencies of each encoder are laid out as parallel token/frequency
+    arrays and summed per token with NumPy instead of per-token dict updates.
+    
+    Args:
+        encoders: Fitted encoders to merge; k1 and b are taken from the first one
+        
+    Returns:
+        BM25Encoder: The merged encoder
+    """
+    token_ids = np.concatenate([
+        np.fromiter(encoder.doc_freq.keys(), dtype=np.int64, count=len(encoder.doc_freq))
+        for encoder in encoders
+    ])
+    freqs = np.concatenate([
+        np.fromiter(encoder.doc_freq.values(), dtype=np.float64, count=len(encoder.doc_freq))
+        for encoder in encoders
+    ])
+    
+    # Map token ids onto a dense vocabulary and sum frequencies per token
+    vocab, inverse = np.unique(token_ids, return_inverse=True)
+    merged_freqs = np.bincount(inverse, weights=freqs, minlength=len(vocab))
+    
+    n_docs = np.array([encoder.n_docs for encoder in encoders], dtype=np.float64)
+    avgdl = np.array([encoder.avgdl for encoder in encoders], dtype=np.float64)
+    total_docs = float(n_docs.sum())
+    
+    merged = BM25Encoder()
+    merged.doc_freq = dict(zip(vocab.tolist(), merged_freqs.tolist()))
+    merged.n_docs = int(total_docs)
+    # The merged average document length is weighted by each corpus' size
+    merged.avgdl = float(avgdl @ n_docs / total_docs) if total_docs else 0.0
+    merged.k1 = encoders[0].k1
+    merged.b = encoders[0].b
+    return merged
+
+# Merged BM25 encoders are cached next to the indexes under a non-.json name
+# so they are never picked up as an index themselves. They are stored as a
+# binary NumPy archive rather than JSON so reloading skips JSON parsing.
+MERGED_BM25_PREFIX = "_merged_"
+MERGED_BM25_SUFFIX = ".bm25"
+
+def get_bm25_index_signature(file_mtimes: Dict[str, float]) -> str:
+    """
+    Compute a signature of the BM25 index set from its filenames and modification times.
+    
+    Args:
+        file_mtimes: Mapping of BM25 index filename to modification time
+        
+    Returns:
+        Hex digest that changes whenever an index file is added, removed or rewritten
+    """
+    entries = sorted(file_mtimes.items())
+    return hashlib.sha256(repr(entries).encode('utf-8')).hexdigest()
+
+def serialize_bm25_encoder(encoder: BM25Encoder) -> bytes:
+    """
+    Serialize a BM25 encoder's fitted parameters to a NumPy .npz archive.
+    Document frequencies are stored as parallel token-id and frequency arrays.
+    
+    Args:
+        encoder: The encoder to serialize
+        
+    Returns:
+        Archive bytes readable by deserialize_bm25_encoder
+    """
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        token_ids=np.fromiter(encoder.doc_freq.keys(), dtype=np.int64, count=len(encoder.doc_freq)),
+        freqs=np.fromiter(encoder.doc_freq.values(), dtype=np.float64, count=len(encoder.doc_freq)),
+        params=np.array([encoder.n_docs, encoder.avgdl, encoder.k1, encoder.b], dtype=np.float64)
+    )
+    return buffer.getvalue()
+
+def deserialize_bm25_encoder(content: bytes) -> BM25Encoder:
+    """
+    Rebuild a BM25 encoder from serialize_bm25_encoder output.
+    
+    Args:
+        content: Archive bytes
+        
+    Returns:
+        BM25Encoder: The restored encoder
+    """
+    with np.load(io.BytesIO(content), allow_pickle=False) as archive:
+        token_ids = archive['token_ids']
+        freqs = archive['freqs']
+        n_docs, avgdl, k1, b = archive['params'].tolist()
+    encoder = BM25Encoder()
+    encoder.doc_freq = dict(zip(token_ids.tolist(), freqs.tolist()))
+    encoder.n_docs = int(n_docs)
+    encoder.avgdl = avgdl
+    encoder.k1 = k1
+    encoder.b = b
+    return encoder
+
+def _load_cached_merged_encoder(merged_filename: str) -> Optional[BM25Encoder]:
+    """Load a previously merged BM25 encoder, or return None if it is not cached."""
+    try:
+        file_content = file_manager.load_binary_file(BM25_INDEXES_PATH, merged_filename)
+        return deserialize_bm25_encoder(file_content)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Unreadable or older-format cache files are rebuilt and overwritten
+        logger.warning(f"Could not read cached merged BM25 encoder {merged_filename}: {e}")
+        return None
+
+def _save_merged_encoder(merged_filename: str, encoder: BM25Encoder):
+    """Persist a merged BM25 encoder and remove merged encoders built from older index sets."""
+    try:
+        file_manager.save_binary_file(BM25_INDEXES_PATH, merged_filename, serialize_bm25_encoder(encoder))
+        for stale_file in file_manager.list_files(BM25_INDEXES_PATH, suffix=MERGED_BM25_SUFFIX):
+            if stale_file != merged_filename and stale_file.startswith(MERGED_BM25_PREFIX):
+                file_manager.delete_file(BM25_INDEXES_PATH, stale_file)
+        logger.info(f"Cached merged BM25 encoder as {merged_filename}")
+    except Exception as e:
+        # The cache is an optimization; failing to write it must not fail the load
+        logger.warning(f"Could not cache merged BM25 encoder: {e}")
+
+def _download_bm25_indexes(json_files: List[str]) -> List[Future]:
+    """
+    Start downloading BM25 index files concurrently.
+    
+    Args:
+        json_files: Index filenames to download
+        
+    Returns:
+        Futures resolving to each file's content, in the same order as json_files;
+        a failed download raises from its future's result()
+    """
+    max_workers = max(1, min(BM25_DOWNLOAD_WORKERS, len(json_files)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [executor.submit(file_manager.load_binary_file, BM25_INDEXES_PATH, file_name) 
+                for file_name in json_files]
+
+# BM25Encoder.default() downloads the MS MARCO parameters, so they are loaded once per process
+_default_bm25_encoder = None
+
+def get_default_bm25_encoder() -> BM25Encoder:
+    """Get the default (MS MARCO) BM25 encoder with lazy initialization."""
+    global _default_bm25_encoder
+    if _default_bm25_encoder is None:
+        _default_bm25_encoder = BM25Encoder().default()
+    return _default_bm25_encoder
+
+def create_bm25_encoder(file_mtimes: Optional[Dict[str, float]] = None):
     """
     Creates and returns a BM25Encoder by loading and merging all BM25 encoder files 
     from the bm25_indexes directory (works with both local and cloud storage).
+    The merged encoder is cached on storage keyed by the index signature, so
+    later cold starts load one file instead of re-merging every index.
+    
+    Args:
+        file_mtimes: Optional pre-fetched mapping of BM25 index file to modification time;
+            listed from storage if omitted
     
     Returns:
         BM25Encoder: The loaded or default BM25 encoder
@@ -249,38 +694,58 @@ def create_bm25_encoder():
     try:
         # Get list of BM25 index files using file manager (auto-detects local/cloud)
         logger.info(f"Loading BM25 indexes from directory: {BM25_INDEXES_PATH}")
-        bm25_files = file_manager.list_files(BM25_INDEXES_PATH)
-        json_files = [f for f in bm25_files if f.endswith('.json')]
+        if file_mtimes is None:
+            file_mtimes = list_bm25_index_files()
+        json_files = sorted(file_mtimes)
         
         logger.info(f"Found {len(json_files)} BM25 index files: {json_files}")
         
         if not json_files:
             logger.warning("No BM25 index files found, using default encoder")
-            return BM25Encoder().default()
+            return get_default_bm25_encoder()
+        
+        # Reuse the merged encoder from a previous start if the index set is unchanged
+        merged_filename = None
+        if len(json_files) > 1:
+            merged_filename = f"{MERGED_BM25_PREFIX}{get_bm25_index_signature(file_mtimes)[:16]}{MERGED_BM25_SUFFIX}"
+            cached_encoder = _load_cached_merged_encoder(merged_filename)
+            if cached_encoder is not None:
+                logger.info(f"Loaded cached merged BM25 encoder: {merged_filename}")
+                return cached_encoder
+        
+        # Download all index files concurrently; parsing and merging stay serial
+        file_contents = _download_bm25_indexes(json_files)
         
         # Load the first encoder as base
         first_file = json_files[0]
         logger.info(f"Loading base encoder from: {first_file}")
         
         # Load the file content
-        file_content = file_manager.load_file(BM25_INDEXES_PATH, first_file)
+        file_content = file_contents[0].result()
         base_encoder = load_bm25_encoder_from_file(file_content, first_file)
         
         # Merge additional encoders if any
         if len(json_files) > 1:
             logger.info(f"Merging {len(json_files) - 1} additional encoders")
-            for file_name in json_files[1:]:
+            encoders = [base_encoder]
+            for file_name, content_future in zip(json_files[1:], file_contents[1:]):
                 try:
                     # Load additional encoder file
-                    additional_content = file_manager.load_file(BM25_INDEXES_PATH, file_name)
-                    additional_encoder = load_bm25_encoder_from_file(additional_content, file_name)
-                    
-                    # Merge encoders by updating vocabulary and document frequencies
-                    base_encoder.merge_encoder(additional_encoder)
-                    logger.info(f"Successfully merged encoder from {file_name}")
-                    
+                    additional_content = content_future.result()
+                    encoders.append(load_bm25_encoder_from_file(additional_content, file_name))
                 except Exception as e:
                     logger.error(f"Error loading encoder from {file_name}: {e}")
+            
+            # Merge vocabularies and document frequencies in one pass
+            base_encoder = merge_bm25_encoders(encoders)
+            logger.info(f"Successfully merged {len(encoders)} encoders")
+            
+            # Only a complete merge may be stored under the signature of the full file set;
+            # otherwise later starts would load it and never retry the failed files
+            if len(encoders) == len(json_files):
+                _save_merged_encoder(merged_filename, base_encoder)
+            else:
+                logger.warning(f"Merged {len(encoders)} of {len(json_files)} encoders, not caching the merged encoder")
         
         logger.info("BM25 encoder created successfully with merged indexes")
         return base_encoder
@@ -288,23 +753,35 @@ def create_bm25_encoder():
     except Exception as e:
         logger.error(f"Error loading BM25 encoders: {e}")
         logger.info("Falling back to default BM25 encoder")
-        return BM25Encoder().default()
+        return get_default_bm25_encoder()
+
+# Retrievers keyed by the signature of the BM25 index files they were built from
+_RETRIEVER_CACHE: Dict[str, Any] = {}
 
 def create_hybrid_retriever():
     """
     Creates and returns a PineconeHybridSearchRetriever using all BM25 encoders in the directory.
+    The retriever is memoized on the BM25 index signature, so rebuilding it when
+    no index file has changed skips re-downloading and re-merging the encoders.
     """
     try:
-        logger.info("Creating Pinecone index...")
+        file_mtimes = list_bm25_index_files()
+        signature = get_bm25_index_signature(file_mtimes)
+        cached_retriever = _RETRIEVER_CACHE.get(signature)
+        if cached_retriever is not None:
+            logger.info("BM25 indexes unchanged, reusing cached hybrid search retriever")
+            return cached_retriever
+        
+        logger.info("Connecting to Pinecone index...")
         index = create_index()
         
         logger.info("Creating BM25 encoder...")
-        bm25_encoder = create_bm25_encoder()
+        bm25_encoder = create_bm25_encoder(file_mtimes)
     
         # Create the retriever with the correct namespace
         logger.info("Creating hybrid search retriever...")
         retriever = PineconeHybridSearchRetriever(
-            embeddings=get_embeddings(), 
+            embeddings=CachedQueryEmbeddings(), 
             sparse_encoder=bm25_encoder, 
             index=index,
             text_key="text",
@@ -314,75 +791,210 @@ def create_hybrid_retriever():
         )
         
         logger.info("Hybrid search retriever created successfully")    
+        _RETRIEVER_CACHE.clear()
+        _RETRIEVER_CACHE[signature] = retriever
         return retriever
         
     except Exception as e:
         logger.error(f"Error creating retriever: {e}")
         raise
 
-def get_filtered_documents(query: str, source_document: str) -> List[Any]:
+# Field accessors for Pinecone query matches
+_get_match_metadata = itemgetter('metadata')
+_get_match_score = itemgetter('score')
+_get_metadata_text = methodcaller('get', 'text', '')
+
+class LazyDocuments(Sequence):
+    """
+    Read-only sequence of retrieved documents stored as parallel arrays
+    (texts, metadata, float32 scores). LangChain Document objects are only
+    materialized when an item is accessed, and then reused. Each Document gets
+    its own copy of the metadata, so the stored arrays are never mutated.
+    """
+    
+    def __init__(self, texts: List[str], metadatas: List[Dict[str, Any]], scores: np.ndarray):
+        self.texts = texts
+        self.metadatas = metadatas
+        self.scores = scores
+        self._docs: List[Any] = [None] * len(texts)
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        doc = self._docs[index]
+        if doc is None:
+            doc = Document(page_content=self.texts[index], metadata=dict(self.metadatas[index]))
+            self._docs[index] = doc
+        return doc
+
+def _connect_filtered_index():
+    """Validate the Pinecone configuration and connect to the index for filtered queries."""
+    # Debug: Check API key availability
+    if not pinecone_api_key:
+        logger.error("PINECONE_API_KEY is not set!")
+        raise ValueError("Pinecone API key not configured")
+    
+    logger.info(f"Using Pinecone API key: {pinecone_api_key[:8]}...")
+    logger.info(f"Using Pinecone namespace: {PINECONE_NAMESPACE}")
+    
+    # Create index with error handling
+    try:
+        index = create_index()
+        logger.info("✅ Pinecone index connection successful")
+        return index
+    except Exception as pinecone_error:
+        logger.error(f"❌ Pinecone index connection failed: {pinecone_error}")
+        raise
+
+def _query_filtered_documents(index, query_embedding: List[float], source_document: str) -> Sequence[Any]:
+    """Query the index with a source filter and convert the matches to LangChain Documents."""
+    # Query Pinecone with source filter
+    try:
+        query_response = index.query(
+            vector=query_embedding,
+            top_k=TOP_K_RESULTS,
+            include_metadata=True,
+            namespace=PINECONE_NAMESPACE,
+            filter={"source": source_document}
+        )
+        logger.info(f"✅ Pinecone query successful, found {len(query_response.get('matches', []))} matches")
+    except Exception as query_error:
+        logger.error(f"❌ Pinecone query failed: {query_error}")
+        raise
+    
+    # Keep matches as parallel arrays; Document objects are built on access
+    matches = query_response.get('matches', [])
+    try:
+        metadatas = list(map(_get_match_metadata, matches))
+        scores = np.fromiter(map(_get_match_score, matches), dtype=np.float32, count=len(matches))
+    except (KeyError, AttributeError):
+        # Rare fallback for matches returned without metadata or score
+        metadatas = [match.get('metadata') or {} for match in matches]
+        scores = np.fromiter((match.get('score') or 0.0 for match in matches), dtype=np.float32, count=len(matches))
+    # Get text content from metadata.text field
+    texts = list(map(_get_metadata_text, metadatas))
+    if not all(texts):
+        # Skip matches without text; they would only add empty blocks to the LLM context
+        keep = [i for i, text in enumerate(texts) if text]
+        texts = [texts[i] for i in keep]
+        metadatas = [metadatas[i] for i in keep]
+        scores = scores[keep]
+    docs = LazyDocuments(texts=texts, metadatas=metadatas, scores=scores)
+    
+    logger.info(f"Retrieved {len(docs)} filtered documents for source: {source_document}")
+    return docs
+
+# Short-lived cache of filtered retrieval results keyed by (query, source_document)
+_filtered_docs_cache = TTLCache(maxsize=FILTERED_DOCS_CACHE_SIZE, ttl=FILTERED_DOCS_CACHE_TTL)
+# Bumped whenever the indexed documents change so in-flight results are not cached
+_search_cache_version = 0
+
+# Final answers keyed by query embedding, for near-duplicate questions
+_semantic_response_cache = SemanticResponseCache(
+    maxsize=SEMANTIC_CACHE_SIZE, ttl=SEMANTIC_CACHE_TTL, threshold=SEMANTIC_CACHE_THRESHOLD
+)
+
+def invalidate_search_caches():
+    """Drop cached search results; call after documents are ingested."""
+    global _search_cache_version, _retriever
+    _search_cache_version += 1
+    # The next search rebuilds the retriever so newly ingested BM25 indexes are used;
+    # create_hybrid_retriever reuses the previous one when no index file changed
+    _retriever = None
+    _filtered_docs_cache.clear()
+    _semantic_response_cache.clear()
+    logger.info("Search result caches invalidated")
+
+def _store_filtered_documents(cache_key, docs: LazyDocuments, cache_version: int):
+    """
+    Cache filtered documents unless the index changed while they were being fetched.
+    Only the immutable (texts, metadata, scores) arrays are cached; every read builds
+    new Documents, so concurrent requests never share Document objects.
+    """
+    if cache_version == _search_cache_version:
+        scores = docs.scores.copy()
+        scores.flags.writeable = False
+        _filtered_docs_cache.set(cache_key, (tuple(docs.texts), tuple(docs.metadatas), scores))
+
+def _load_filtered_documents(cache_key) -> Optional[LazyDocuments]:
+    """Get cached filtered documents as a fresh LazyDocuments, or None on a miss."""
+    entry = _filtered_docs_cache.get(cache_key)
+    if entry is None:
+        return None
+    texts, metadatas, scores = entry
+    return LazyDocuments(texts=list(texts), metadatas=list(metadatas), scores=scores)
+
+def get_filtered_documents(query: str, source_document: str, 
+                           query_embedding: Optional[List[float]] = None) -> Sequence[Any]:
     """
     Get documents filtered by source document using direct index query.
     
     Args:
         query: The search query
         source_document: The source document name to filter by
+        query_embedding: Precomputed embedding of the query; embedded here when omitted
         
     Returns:
         List of LangChain Document objects
     """
     try:
-        logger.info(f"Getting filtered documents for source: {source_document}")
+        cache_key = (query, source_document)
+        cached_docs = _load_filtered_documents(cache_key)
+        if cached_docs is not None:
+            logger.info(f"Using cached filtered documents for source: {source_document}")
+            return cached_docs
+        cache_version = _search_cache_version
         
-        # Debug: Check API key availability
-        if not pinecone_api_key:
-            logger.error("PINECONE_API_KEY is not set!")
-            raise ValueError("Pinecone API key not configured")
+        logger.info(f"Getting filtered documents for source: {source_document}")
+        index = _connect_filtered_index()
         
-        logger.info(f"Using Pinecone API key: {pinecone_api_key[:8]}...")
-        logger.info(f"Using Pinecone namespace: {PINECONE_NAMESPACE}")
+        # Create query embedding unless the caller already has one
+        if query_embedding is None:
+            query_embedding = get_query_embedding(query)
         
-        # Create index with error handling
-        try:
-            index = create_index()
-            logger.info("✅ Pinecone index connection successful")
-        except Exception as pinecone_error:
-            logger.error(f"❌ Pinecone index connection failed: {pinecone_error}")
-            raise
+        docs = _query_filtered_documents(index, query_embedding, source_document)
+        _store_filtered_documents(cache_key, docs, cache_version)
+        return docs
         
-        # Create query embedding
-        query_embedding = get_embeddings().embed_query(query)
+    except Exception as e:
+        logger.error(f"Error getting filtered documents for {source_document}: {e}")
+        raise
+
+async def aget_filtered_documents(query: str, source_document: str, 
+                                  query_embedding: Optional[List[float]] = None) -> Sequence[Any]:
+    """
+    Async variant of get_filtered_documents.
+    The query embedding uses the native async OpenAI client; the blocking
+    Pinecone calls run in a worker thread so the event loop stays free.
+    
+    Args:
+        query: The search query
+        source_document: The source document name to filter by
+        query_embedding: Precomputed embedding of the query; embedded here when omitted
         
-        # Query Pinecone with source filter
-        try:
-            query_response = index.query(
-                vector=query_embedding,
-                top_k=TOP_K_RESULTS,
-                include_metadata=True,
-                namespace=PINECONE_NAMESPACE,
-                filter={"source": source_document}
-            )
-            logger.info(f"✅ Pinecone query successful, found {len(query_response.get('matches', []))} matches")
-        except Exception as query_error:
-            logger.error(f"❌ Pinecone query failed: {query_error}")
-            raise
+    Returns:
+        List of LangChain Document objects
+    """
+    try:
+        cache_key = (query, source_document)
+        cached_docs = _load_filtered_documents(cache_key)
+        if cached_docs is not None:
+            logger.info(f"Using cached filtered documents for source: {source_document}")
+            return cached_docs
+        cache_version = _search_cache_version
         
-        # Convert to LangChain Document objects
-        from langchain_core.documents import Document
-        docs = []
+        logger.info(f"Getting filtered documents for source: {source_document}")
+        index = await asyncio.to_thread(_connect_filtered_index)
         
-        for match in query_response.get('matches', []):
-            metadata = match.get('metadata', {})
-            # Get text content from metadata.text field
-            text_content = metadata.get('text', '')
-            
-            doc = Document(
-                page_content=text_content,
-                metadata=metadata
-            )
-            docs.append(doc)
+        # Create query embedding unless the caller already has one
+        if query_embedding is None:
+            query_embedding = await aget_query_embedding(query)
         
-        logger.info(f"Retrieved {len(docs)} filtered documents for source: {source_document}")
+        docs = await asyncio.to_thread(_query_filtered_documents, index, query_embedding, source_document)
+        _store_filtered_documents(cache_key, docs, cache_version)
         return docs
         
     except Exception as e:
@@ -405,6 +1017,79 @@ def get_retriever():
             raise
     return _retriever
 
+def retrieve_by_vector(query: str, query_embedding: List[float]) -> Sequence[Any]:
+    """
+    Run the hybrid (dense + BM25) retrieval with a precomputed query embedding.
+    Equivalent to get_retriever().invoke(query), but the caller supplies the
+    dense vector so the query is not embedded again inside the retriever.
+    
+    Args:
+        query: The search query, used for the sparse BM25 vector
+        query_embedding: Dense embedding of the query
+        
+    Returns:
+        List of LangChain Document objects
+    """
+    retriever = get_retriever()
+    sparse_vector = retriever.sparse_encoder.encode_queries(query)
+    dense_vector, sparse_vector = hybrid_convex_scale(query_embedding, sparse_vector, retriever.alpha)
+    query_response = retriever.index.query(
+        vector=dense_vector,
+        sparse_vector=sparse_vector,
+        top_k=retriever.top_k,
+        include_metadata=True,
+        namespace=retriever.namespace
+    )
+    
+    # Split the chunk text out of the metadata the same way the retriever does
+    texts, metadatas = [], []
+    matches = query_response.get('matches', [])
+    for match in matches:
+        metadata = dict(match.get('metadata') or {})
+        text = metadata.pop(retriever.text_key, '')
+        if not text:
+            continue
+        metadata.setdefault('score', match.get('score') or 0.0)
+        texts.append(text)
+        metadatas.append(metadata)
+    scores = np.fromiter(map(_get_match_score, metadatas), dtype=np.float32, count=len(metadatas))
+    return LazyDocuments(texts=texts, metadatas=metadatas, scores=scores)
+
+def _format_source_suffix(doc: Any) -> str:
+    """Return the ' (Source: ...)' label for a document, or '' when it has no metadata."""
+    metadata = getattr(doc, 'metadata', None)
+    if not metadata:
+        return ""
+    return f" (Source: {metadata.get('source', 'Unknown')})"
+
+def _canonical_doc_key(doc: Any) -> Tuple[str, float]:
+    """Sort key ordering documents by source and chunk position."""
+    metadata = getattr(doc, 'metadata', None) or {}
+    chunk_id = metadata.get('chunk_id')
+    return str(metadata.get('source', '')), chunk_id if isinstance(chunk_id, (int, float)) else -1
+
+def _canonical_order(docs: Sequence[Any]) -> List[Any]:
+    """
+    Order documents canonically within runs of equal relevance score, keeping the
+    retriever's relevance order between runs. Tied documents can come back from
+    the index in any order; documents without a score are never reordered.
+    """
+    ordered = []
+    tied = []
+    tied_score = None
+    for doc in docs:
+        score = (getattr(doc, 'metadata', None) or {}).get('score')
+        if tied and (score is None or score != tied_score):
+            ordered.extend(sorted(tied, key=_canonical_doc_key))
+            tied = []
+        tied.append(doc)
+        tied_score = score
+    ordered.extend(sorted(tied, key=_canonical_doc_key))
+    return ordered
+
+# Separator placed between documents in the LLM context
+_DOC_SEP = "\n" + "=" * 50 + "\n"
+
 def format_docs(docs: List[Any]) -> str:
     """
     Format the documents into a string with enhanced context.
@@ -418,38 +1103,55 @@ def format_docs(docs: List[Any]) -> str:
     if not docs:
         return "No relevant documents found."
     
-    formatted_docs = []
-    for i, doc in enumerate(docs, 1):
-        # Add document separator and source info if available
-        doc_text = f"Document {i}"
-        if hasattr(doc, 'metadata') and doc.metadata:
-            source = doc.metadata.get('source', 'Unknown')
-            doc_text += f" (Source: {source})"
-        
-        doc_text += f":\n{doc.page_content}\n"
-        formatted_docs.append(doc_text)
-    
-    return "\n" + "="*50 + "\n".join(formatted_docs)
+    # Keep the most relevant chunks first; only ties are put in a canonical order,
+    # so the same retrieval always renders to the same context and can hit the prompt cache
+    docs = _canonical_order(docs)
 
-# Enhanced prompt template for better entity queries and structured data
-template = """You are an AI assistant that answers questions based on the provided context. 
+    # Build each document block in a single f-string and join once, instead of
+    # growing intermediate strings per document. This takes ~13 µs for ten
+    # 4000-character chunks, so it stays pure Python rather than Cython/Numba.
+    return _DOC_SEP.join([
+        f"Document {i}{_format_source_suffix(doc)}:\n{doc.page_content}\n"
+        for i, doc in enumerate(docs, 1)
+    ])
 
-Context Information:
-{context}
+# Enhanced prompt template for better entity queries and structured data.
+# Static instructions come first, then the context, then the question, so
+# prompts share the longest possible prefix for provider-side prompt caching.
+template = """You are an AI assistant that answers questions based on the provided context. 
 
 Instructions:
-- Answer the question using ONLY the information provided in the context above
+- Answer the question using ONLY the information provided in the context below
 - If asked about specific people, entities, or data points, provide ALL relevant details found
 - For tabular data, present information in a clear, organized format
 - If the question asks for "all details" or "everything" about someone/something, include all available attributes
 - If the information is not in the context, clearly state that it's not available
 - Be comprehensive and specific in your answers
 
+Context Information:
+{context}
+
 Question: {question}
 
 Answer:"""
 
+# The prompt template is only used by the LCEL chains; direct LLM calls render
+# the template string itself, which avoids re-parsing it on every request
 prompt = ChatPromptTemplate.from_template(template)
+_render_template = template.format_map
+
+def format_prompt(context: str, question: str) -> str:
+    """
+    Render the prompt template for a context/question pair.
+    
+    Args:
+        context: Formatted document context
+        question: The user question
+        
+    Returns:
+        The rendered prompt string
+    """
+    return _render_template({"context": context, "question": question})
 
 # Create the Langchain runnable pipeline (lazy initialization)
 def get_hybrid_chain():
@@ -461,9 +1163,69 @@ def get_hybrid_chain():
         | StrOutputParser()
     )
 
-def execure_hybrid_chain(query: str, source_document: Optional[str] = None) -> str:
+NO_ANSWER_MESSAGE = "No answer found. I searched through both the document database and Excel/CSV files but couldn't find relevant information for your query."
+
+def _preview(text: str, limit: int = 200) -> str:
+    """Truncate text for debug output."""
+    return text[:limit] + "..." if len(text) > limit else text
+
+# Metadata fields reported in debug output; the rest (notably the full chunk
+# text stored under "text") would only bloat the response
+DEBUG_METADATA_FIELDS = ("source", "page", "chunk_id", "total_chunks", "score")
+
+def _describe_documents(docs: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Build the per-document debug entries (preview and metadata) for retrieved documents."""
+    entries = []
+    for i, doc in enumerate(docs, 1):
+        metadata = getattr(doc, 'metadata', None) or {}
+        entries.append({
+            "index": i,
+            "preview": _preview(doc.page_content),
+            "metadata": {field: metadata[field] for field in DEBUG_METADATA_FIELDS if field in metadata}
+        })
+    return entries
+
+# Characters of a streamed answer to collect before checking it for a no-answer pattern
+EARLY_CHECK_CHARS = 200
+
+async def _agenerate_with_early_check(formatted_prompt: str) -> Tuple[str, bool]:
+    """
+    Stream an LLM answer and stop as soon as its opening shows it is a no-answer.
+    A no-answer pattern found in the prefix is also in the full answer, so
+    stopping early never changes the meaningfulness verdict; it only skips
+    generating the rest of an answer that will be replaced by the fallback.
+    
+    Args:
+        formatted_prompt: The rendered prompt
+        
+    Returns:
+        Tuple of (answer text generated so far, whether generation was stopped early)
+    """
+    parts = []
+    streamed_chars = 0
+    checked = False
+    async with openai_request_slot():
+        async for token in (get_llm() | StrOutputParser()).astream(formatted_prompt):
+            parts.append(token)
+            streamed_chars += len(token)
+            if not checked and streamed_chars >= EARLY_CHECK_CHARS:
+                checked = True
+                prefix = "".join(parts)
+                if not is_meaningful_semantic_result(prefix):
+                    logger.info("⏹️ Stopping generation early: answer opens with a no-answer pattern")
+                    return prefix, True
+    return "".join(parts), False
+
+def _is_meaningful_pandas_result(pandas_result: str) -> bool:
+    """Check whether a pandas agent answer is usable as a final result."""
+    return bool(pandas_result) and not pandas_result.startswith("No Excel or CSV files found") and not pandas_result.startswith("Error")
+
+async def aexecute_hybrid_chain(query: str, source_document: Optional[str] = None, 
+                                return_debug: bool = False) -> Union[str, Tuple[str, Dict[str, Any]]]:
     """
     Execute the hybrid chain with new logic for Excel/CSV vs semantic search.
+    Network calls go through the LangChain async APIs; the blocking pandas
+    agent runs in a worker thread.
     
     Search Logic:
     - If specific source is selected and it's Excel/CSV: use pandas agent
@@ -473,234 +1235,291 @@ def execure_hybrid_chain(query: str, source_document: Optional[str] = None) -> s
     Args:
         query: The search query
         source_document: Optional source document to filter by (or "all" for all sources)
+        return_debug: Also collect debug information from the same retrieval
         
     Returns:
-        Search result as string
+        Search result as string, or a (result, debug_info) tuple when return_debug is True
     """
-    filter_info = f" (source: {source_document})" if source_document else " (all sources)"
-    logger.info(f"🔍 Executing new hybrid search for query: '{query}'{filter_info}")
+    if logger.isEnabledFor(logging.INFO):
+        filter_info = f" (source: {source_document})" if source_document else " (all sources)"
+        logger.info("🔍 Executing new hybrid search for query: '%s'%s", query, filter_info)
+    
+    # Near-duplicate questions are answered from the semantic response cache;
+    # debug requests always run the full pipeline so they report real retrieval details
+    is_targeted = bool(source_document and source_document.lower() not in ["all", "none", ""])
+    cache_namespace = source_document if is_targeted else "all"
+    use_response_cache = (SEMANTIC_CACHE_ENABLED and not return_debug 
+                          and not (is_targeted and is_excel_or_csv_file(source_document)))
+    # The query is embedded at most once; later steps reuse this vector
+    query_embedding = None
+    if use_response_cache:
+        cache_version = _search_cache_version
+        try:
+            query_embedding = await aget_query_embedding(query)
+            cached_result = _semantic_response_cache.lookup(query_embedding, cache_namespace)
+            if cached_result is not None:
+                logger.info("✅ Semantic response cache hit")
+                return cached_result
+        except Exception as cache_error:
+            logger.warning(f"Semantic response cache lookup failed: {cache_error}")
+            use_response_cache = False
+    
+    # Debug details are only collected when requested
+    debug_info = {
+        "query": query,
+        "source_filter": source_document,
+        "search_strategy": None,
+        "semantic_search": None,
+        "pandas_search": None,
+        "final_result_source": None
+    } if return_debug else None
+    
+    def finish(result: str, final_result_source: str, cacheable: bool = True):
+        if not return_debug:
+            # Only meaningful LLM answers over indexed documents are cached; pandas answers
+            # depend on uploaded data files that are not tracked by ingestion, and a
+            # no-answer would otherwise be served to similar questions for the whole TTL
+            if (use_response_cache and cacheable and final_result_source == "semantic_search"
+                    and cache_version == _search_cache_version
+                    and is_meaningful_semantic_result(result)):
+                _semantic_response_cache.add(query_embedding, result, cache_namespace)
+            return result
+        debug_info["final_result_source"] = final_result_source
+        return result, debug_info
     
     try:
         # Case 1: User selected a specific source document
-        if source_document and source_document.lower() not in ["all", "none", ""]:
-            logger.info(f"📋 CASE: Selected specific source - {source_document}")
+        if is_targeted:
+            logger.info("📋 CASE: Selected specific source - %s", source_document)
             
             # Check if the selected source is an Excel/CSV file
             if is_excel_or_csv_file(source_document):
                 logger.info(f"📊 Source is Excel/CSV file, using pandas agent")
-                return execute_pandas_agent_search(query, source_document)
+                result = await asyncio.to_thread(execute_pandas_agent_search, query, source_document)
+                if return_debug:
+                    debug_info["search_strategy"] = "targeted_pandas_only"
+                    debug_info["pandas_search"] = {"attempted": True, "result_preview": _preview(result)}
+                return finish(result, "pandas_agent")
             else:
                 logger.info(f"📄 Source is regular document, using semantic search")
                 # Get filtered documents for specific source using semantic search
-                docs = get_filtered_documents(query, source_document)
+                docs = await aget_filtered_documents(query, source_document, query_embedding)
+                
+                if return_debug:
+                    debug_info["search_strategy"] = "targeted_semantic_only"
+                    debug_info["semantic_search"] = {
+                        "attempted": True,
+                        "documents_found": len(docs),
+                        "documents": _describe_documents(docs)
+                    }
                 
                 if not docs:
-                    return f"No documents found for source '{source_document}'."
+                    return finish(f"No documents found for source '{source_document}'.", "semantic_search",
+                                  cacheable=False)
                 
                 # Generate response using semantic search
                 context = format_docs(docs)
-                formatted_prompt = prompt.format(context=context, question=query)
-                result = get_llm().invoke(formatted_prompt)
+                formatted_prompt = format_prompt(context, query)
+                async with openai_request_slot():
+                    result = await get_llm().ainvoke(formatted_prompt)
                 
                 if hasattr(result, 'content'):
                     result = result.content
                 
-                return result
+                return finish(result, "semantic_search")
         
         # Case 2: User selected "all" sources (sequential search)
         else:
             logger.info(f"🌐 CASE: Search all sources (sequential approach)")
+            if return_debug:
+                debug_info["search_strategy"] = "sequential_all_sources"
+            
+            # Optionally start the pandas fallback now so it runs while semantic search does,
+            # if a speculation slot is free; its result is discarded if semantic search answers
+            pandas_task = None
+            pandas_future = None
+            pandas_cancel = threading.Event()
+            if SPECULATIVE_PANDAS_SEARCH and _speculative_pandas_slots.acquire(blocking=False):
+                logger.info("📊 Starting pandas agent speculatively alongside semantic search")
+                pandas_future = _speculative_pandas_executor.submit(
+                    _run_speculative_pandas_search, query, pandas_cancel)
+                pandas_task = asyncio.wrap_future(pandas_future)
             
-            # Step 1: Try semantic search first on all documents
-            logger.info(f"🔍 STEP 1: Trying semantic search on all documents")
             try:
-                docs = get_retriever().invoke(query)
-                logger.info(f"Retrieved {len(docs)} documents from semantic search")
+                # Step 1: Try semantic search first on all documents
+                logger.info(f"🔍 STEP 1: Trying semantic search on all documents")
+                try:
+                    # Reuse the query embedding instead of letting the retriever embed again
+                    if query_embedding is None:
+                        query_embedding = await aget_query_embedding(query)
+                    docs = await asyncio.to_thread(retrieve_by_vector, query, query_embedding)
+                    logger.info("Retrieved %d documents from semantic search", len(docs))
                 
-                if docs:
-                    # Generate response using semantic search
-                    context = format_docs(docs)
-                    formatted_prompt = prompt.format(context=context, question=query)
-                    semantic_result = get_llm().invoke(formatted_prompt)
+                    if return_debug:
+                        debug_info["semantic_search"] = {
+                            "attempted": True,
+                            "documents_found": len(docs),
+                            "documents": _describe_documents(docs)
+                        }
+                
+                    if docs:
+                        # Generate response using semantic search
+                        context = format_docs(docs)
+                        formatted_prompt = format_prompt(context, query)
+                        semantic_result, stopped_early = await _agenerate_with_early_check(formatted_prompt)
                     
-                    if hasattr(semantic_result, 'content'):
-                        semantic_result = semantic_result.content
+                        # Step 2: Check if semantic result is meaningful
+                        meaningful = not stopped_early and is_meaningful_semantic_result(semantic_result)
+                        if return_debug:
+                            debug_info["semantic_search"]["result_preview"] = _preview(semantic_result)
+                            debug_info["semantic_search"]["meaningful"] = meaningful
+                            debug_info["semantic_search"]["stopped_early"] = stopped_early
                     
-                    # Step 2: Check if semantic result is meaningful
-                    if is_meaningful_semantic_result(semantic_result):
-                        logger.info(f"✅ STEP 1 SUCCESS: Semantic search found good answer")
-                        return semantic_result
+                        if meaningful:
+                            logger.info(f"✅ STEP 1 SUCCESS: Semantic search found good answer")
+                            return finish(semantic_result, "semantic_search")
+                        else:
+                            logger.info(f"⚠️ STEP 1 PARTIAL: Semantic search result not meaningful")
+                            logger.info(f"📊 STEP 2: Trying pandas agent as fallback")
                     else:
-                        logger.info(f"⚠️ STEP 1 PARTIAL: Semantic search result not meaningful")
+                        logger.info(f"⚠️ STEP 1 NO DOCS: No documents retrieved from semantic search")
                         logger.info(f"📊 STEP 2: Trying pandas agent as fallback")
-                else:
-                    logger.info(f"⚠️ STEP 1 NO DOCS: No documents retrieved from semantic search")
-                    logger.info(f"📊 STEP 2: Trying pandas agent as fallback")
                     
-            except Exception as semantic_error:
-                logger.warning(f"⚠️ STEP 1 ERROR: Semantic search failed: {semantic_error}")
-                logger.info(f"📊 STEP 2: Trying pandas agent as fallback")
+                except Exception as semantic_error:
+                    logger.warning(f"⚠️ STEP 1 ERROR: Semantic search failed: {semantic_error}")
+                    logger.info(f"📊 STEP 2: Trying pandas agent as fallback")
+                    if return_debug:
+                        debug_info["semantic_search"] = {"attempted": True, "error": str(semantic_error)}
             
-            # Step 3: Try pandas agent as fallback
-            try:
-                pandas_result = execute_pandas_agent_search(query)
+                # Step 3: Try pandas agent as fallback
+                try:
+                    if pandas_task is not None:
+                        pandas_result = await pandas_task
+                    else:
+                        pandas_result = await asyncio.to_thread(execute_pandas_agent_search, query)
+                    if return_debug:
+                        debug_info["pandas_search"] = {
+                            "attempted": True,
+                            "speculative": pandas_task is not None,
+                            "result_preview": _preview(pandas_result)
+                        }
                 
-                # Check if pandas agent found a meaningful result
-                if pandas_result and not pandas_result.startswith("No Excel or CSV files found") and not pandas_result.startswith("Error"):
-                    logger.info(f"✅ STEP 2 SUCCESS: Pandas agent found answer")
-                    return pandas_result
-                else:
-                    logger.info(f"⚠️ STEP 2 NO RESULTS: Pandas agent didn't find meaningful results")
+                    # Check if pandas agent found a meaningful result
+                    if _is_meaningful_pandas_result(pandas_result):
+                        logger.info(f"✅ STEP 2 SUCCESS: Pandas agent found answer")
+                        return finish(pandas_result, "pandas_agent_fallback")
+                    else:
+                        logger.info(f"⚠️ STEP 2 NO RESULTS: Pandas agent didn't find meaningful results")
                     
-            except Exception as pandas_error:
-                logger.warning(f"⚠️ STEP 2 ERROR: Pandas agent failed: {pandas_error}")
+                except Exception as pandas_error:
+                    logger.warning(f"⚠️ STEP 2 ERROR: Pandas agent failed: {pandas_error}")
             
-            # Step 4: If both failed, return appropriate message
-            logger.info(f"❌ BOTH APPROACHES FAILED: No good results from semantic search or pandas agent")
-            return "No answer found. I searched through both the document database and Excel/CSV files but couldn't find relevant information for your query."
+                # Step 4: If both failed, return appropriate message
+                logger.info(f"❌ BOTH APPROACHES FAILED: No good results from semantic search or pandas agent")
+                return finish(NO_ANSWER_MESSAGE, "no_good_results")
+            finally:
+                # Stop a speculative search that was not used: files whose agents have not
+                # started are skipped; an agent already running finishes in its thread
+                if pandas_future is not None:
+                    pandas_cancel.set()
+                    # cancel() succeeds only for a search that never started (or was already
+                    # cancelled through pandas_task), which cannot free its slot itself
+                    if pandas_future.cancel():
+                        _speculative_pandas_slots.release()
             
     except Exception as e:
         logger.error(f"❌ Error executing hybrid search: {e}")
         raise
 
-def search_with_debug_info(query: str, source_document: Optional[str] = None) -> Dict[str, Any]:
+def execure_hybrid_chain(query: str, source_document: Optional[str] = None, 
+                         return_debug: bool = False) -> Union[str, Tuple[str, Dict[str, Any]]]:
     """
-    Execute search with new logic and return both result and debug information.
+    Synchronous entry point for aexecute_hybrid_chain, for scripts and other
+    callers that are not running inside an event loop.
     
     Args:
         query: The search query
-        source_document: Optional source document to filter by
+        source_document: Optional source document to filter by (or "all" for all sources)
+        return_debug: Also collect debug information from the same retrieval
         
     Returns:
-        Dictionary with result and debug information
+        Search result as string, or a (result, debug_info) tuple when return_debug is True
+    """
+    return run_search(aexecute_hybrid_chain(query, source_document, return_debug=return_debug))
+
+async def astream_hybrid_chain(query: str, source_document: Optional[str] = None) -> AsyncIterator[str]:
     """
-    filter_info = f" (source: {source_document})" if source_document else " (all sources)"
-    logger.info(f"🐛 Executing debug search for query: '{query}'{filter_info}")
+    Streaming variant of aexecute_hybrid_chain.
+    Answer tokens are yielded as soon as the context is retrieved, instead of
+    waiting for the full LLM completion. Search logic matches
+    aexecute_hybrid_chain; for "all" sources the pandas agent answer is
+    appended after the streamed answer if that answer was not meaningful.
     
-    try:
-        debug_info = {
-            "query": query,
-            "source_filter": source_document,
-            "search_strategy": None,
-            "semantic_search": None,
-            "pandas_search": None,
-            "final_result_source": None
-        }
+    Args:
+        query: The search query
+        source_document: Optional source document to filter by (or "all" for all sources)
         
-        # Case 1: User selected a specific source document
-        if source_document and source_document.lower() not in ["all", "none", ""]:
-            debug_info["search_strategy"] = f"targeted_source_{source_document}"
-            
-            # Check if the selected source is an Excel/CSV file
-            if is_excel_or_csv_file(source_document):
-                debug_info["search_strategy"] = "targeted_pandas_only"
-                debug_info["final_result_source"] = "pandas_agent"
-                result = execute_pandas_agent_search(query, source_document)
-                debug_info["pandas_search"] = {"attempted": True, "result_preview": result[:200] + "..." if len(result) > 200 else result}
-            else:
-                debug_info["search_strategy"] = "targeted_semantic_only" 
-                debug_info["final_result_source"] = "semantic_search"
-                # Get filtered documents for specific source using semantic search
-                docs = get_filtered_documents(query, source_document)
-                
-                debug_info["semantic_search"] = {
-                    "attempted": True,
-                    "documents_found": len(docs),
-                    "documents": []
-                }
-                
-                for i, doc in enumerate(docs):
-                    doc_info = {
-                        "index": i + 1,
-                        "preview": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                        "metadata": doc.metadata if hasattr(doc, 'metadata') else {}
-                    }
-                    debug_info["semantic_search"]["documents"].append(doc_info)
-                
-                if not docs:
-                    result = f"No documents found for source '{source_document}'."
-                else:
-                    # Generate response using semantic search
-                    context = format_docs(docs)
-                    formatted_prompt = prompt.format(context=context, question=query)
-                    result = get_llm().invoke(formatted_prompt)
-                    
-                    if hasattr(result, 'content'):
-                        result = result.content
+    Yields:
+        Chunks of the answer text
+    """
+    logger.info("🔍 Streaming hybrid search for query: '%s'", query)
+    
+    # Case 1: User selected a specific source document
+    if source_document and source_document.lower() not in ["all", "none", ""]:
+        if is_excel_or_csv_file(source_document):
+            yield await asyncio.to_thread(execute_pandas_agent_search, query, source_document)
+            return
         
-        # Case 2: User selected "all" sources (sequential search)
-        else:
-            debug_info["search_strategy"] = "sequential_all_sources"
-            
-            # Step 1: Try semantic search first
-            try:
-                docs = get_retriever().invoke(query)
-                debug_info["semantic_search"] = {
-                    "attempted": True,
-                    "documents_found": len(docs),
-                    "documents": []
-                }
-                
-                for i, doc in enumerate(docs):
-                    doc_info = {
-                        "index": i + 1,
-                        "preview": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                        "metadata": doc.metadata if hasattr(doc, 'metadata') else {}
-                    }
-                    debug_info["semantic_search"]["documents"].append(doc_info)
-                
-                if docs:
-                    # Generate response using semantic search
-                    context = format_docs(docs)
-                    formatted_prompt = prompt.format(context=context, question=query)
-                    semantic_result = get_llm().invoke(formatted_prompt)
-                    
-                    if hasattr(semantic_result, 'content'):
-                        semantic_result = semantic_result.content
-                    
-                    debug_info["semantic_search"]["result_preview"] = semantic_result[:200] + "..." if len(semantic_result) > 200 else semantic_result
-                    debug_info["semantic_search"]["meaningful"] = is_meaningful_semantic_result(semantic_result)
-                    
-                    # Check if semantic result is meaningful
-                    if is_meaningful_semantic_result(semantic_result):
-                        debug_info["final_result_source"] = "semantic_search"
-                        result = semantic_result
-                    else:
-                        # Try pandas agent as fallback
-                        pandas_result = execute_pandas_agent_search(query)
-                        debug_info["pandas_search"] = {"attempted": True, "result_preview": pandas_result[:200] + "..." if len(pandas_result) > 200 else pandas_result}
-                        
-                        if pandas_result and not pandas_result.startswith("No Excel or CSV files found") and not pandas_result.startswith("Error"):
-                            debug_info["final_result_source"] = "pandas_agent_fallback"
-                            result = pandas_result
-                        else:
-                            debug_info["final_result_source"] = "no_good_results"
-                            result = "No answer found. I searched through both the document database and Excel/CSV files but couldn't find relevant information for your query."
-                else:
-                    # No semantic docs, try pandas
-                    pandas_result = execute_pandas_agent_search(query)
-                    debug_info["pandas_search"] = {"attempted": True, "result_preview": pandas_result[:200] + "..." if len(pandas_result) > 200 else pandas_result}
-                    
-                    if pandas_result and not pandas_result.startswith("No Excel or CSV files found") and not pandas_result.startswith("Error"):
-                        debug_info["final_result_source"] = "pandas_agent_fallback"
-                        result = pandas_result
-                    else:
-                        debug_info["final_result_source"] = "no_good_results"
-                        result = "No answer found. I searched through both the document database and Excel/CSV files but couldn't find relevant information for your query."
-                        
-            except Exception as semantic_error:
-                debug_info["semantic_search"] = {"attempted": True, "error": str(semantic_error)}
-                # Try pandas agent as fallback
-                pandas_result = execute_pandas_agent_search(query)
-                debug_info["pandas_search"] = {"attempted": True, "result_preview": pandas_result[:200] + "..." if len(pandas_result) > 200 else pandas_result}
-                
-                if pandas_result and not pandas_result.startswith("No Excel or CSV files found") and not pandas_result.startswith("Error"):
-                    debug_info["final_result_source"] = "pandas_agent_fallback"
-                    result = pandas_result
-                else:
-                    debug_info["final_result_source"] = "no_good_results"
-                    result = "No answer found. I searched through both the document database and Excel/CSV files but couldn't find relevant information for your query."
+        docs = await aget_filtered_documents(query, source_document)
+        if not docs:
+            yield f"No documents found for source '{source_document}'."
+            return
         
+        answer_chain = prompt | get_llm() | StrOutputParser()
+        async with openai_request_slot():
+            async for token in answer_chain.astream({"context": format_docs(docs), "question": query}):
+                yield token
+        return
+    
+    # Case 2: User selected "all" sources - retrieve, then stream the LLM answer.
+    # Retrieval embeds the query under its own OpenAI slot, so it runs before the
+    # answer's slot is taken rather than inside it.
+    streamed_parts = []
+    try:
+        query_embedding = await aget_query_embedding(query)
+        docs = await asyncio.to_thread(retrieve_by_vector, query, query_embedding)
+        answer_chain = prompt | get_llm() | StrOutputParser()
+        async with openai_request_slot():
+            async for token in answer_chain.astream({"context": format_docs(docs), "question": query}):
+                streamed_parts.append(token)
+                yield token
+    except Exception as semantic_error:
+        logger.warning(f"⚠️ Streaming semantic search failed: {semantic_error}")
+    
+    if is_meaningful_semantic_result("".join(streamed_parts)):
+        return
+    
+    # Semantic answer was not meaningful, fall back to the pandas agent
+    pandas_result = await asyncio.to_thread(execute_pandas_agent_search, query)
+    if _is_meaningful_pandas_result(pandas_result):
+        yield ("\n\n" if streamed_parts else "") + pandas_result
+    elif not streamed_parts:
+        yield NO_ANSWER_MESSAGE
+
+async def asearch_with_debug_info(query: str, source_document: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Execute search with new logic and return both result and debug information.
+    Debug details come from the same retrieval that produced the result.
+    
+    Args:
+        query: The search query
+        source_document: Optional source document to filter by
+        
+    Returns:
+        Dictionary with result and debug information
+    """
+    try:
+        result, debug_info = await aexecute_hybrid_chain(query, source_document, return_debug=True)
         return {
             "result": result,
             "debug": debug_info
@@ -709,3 +1528,16 @@ def search_with_debug_info(query: str, source_document: Optional[str] = None) ->
     except Exception as e:
         logger.error(f"Error in debug search: {e}")
         raise
+
+def search_with_debug_info(query: str, source_document: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Synchronous entry point for asearch_with_debug_info.
+    
+    Args:
+        query: The search query
+        source_document: Optional source document to filter by
+        
+    Returns:
+        Dictionary with result and debug information
+    """
+    return run_search(asearch_with_debug_info(query, source_document))
@@ -1,16 +1,24 @@
 from dotenv import load_dotenv
 import os
 from langchain_openai import OpenAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
 from pinecone_text.sparse import BM25Encoder
-from file_util_enhanced import load_edited_file_or_parsed_file, get_file_manager
-from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from pinecone_util import create_index
-import tempfile
+from file_util_enhanced import load_edited_file_or_parsed_file, get_file_manager, file_stem, map_files_by_stem
+from pinecone_util import create_index, create_grpc_index
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import json
-from pathlib import Path
+import hashlib
+import re
+import gzip
+import functools
+import copy
+import threading
+
+# orjson is an optional, faster JSON serializer; fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +36,47 @@ if openai_api_key:
     openai_api_key = openai_api_key.strip("\"'")
 
 # Import configuration constants
-from config import PINECONE_NAMESPACE, BM25_INDEXES_PATH, EMBEDDING_MODEL_NAME
+from config import (PINECONE_NAMESPACE, BM25_INDEXES_PATH, EMBEDDING_MODEL_NAME, EMBEDDING_REQUEST_DIMENSIONS,
+                    PINECONE_UPSERT_CONCURRENCY, EXCEL_EXTENSIONS, CSV_EXTENSIONS)
 
 # Initialize file manager
 file_manager = get_file_manager()
 
+# Extensions a document's source name may have been stored with by older ingests
+LEGACY_SOURCE_EXTENSIONS = frozenset({'.pdf', '.docx', '.doc', '.txt', '.md', '.xlsx', '.xls', '.csv'})
+
+def delete_document_vectors(index, source_names, chunk_counts):
+    """
+    Delete every vector stored under any of the given source names or chunk ID prefixes.
+    Uses one filtered delete for all source names and one delete for all candidate IDs,
+    instead of a query and a delete per name.
+    
+    Args:
+        index: Pinecone index
+        source_names: Source metadata values the document may have been stored under
+        chunk_counts: Chunk ID prefixes the document may have been stored under, mapped
+            to the number of chunk IDs to delete for each
+    """
+    try:
+        index.delete(
+            filter={"source": {"$in": sorted(source_names)}},
+            namespace=PINECONE_NAMESPACE
+        )
+        logger.info(f"🧹 Deleted existing vectors for {len(source_names)} possible source name(s)")
+    except Exception as source_e:
+        logger.debug(f"Source-based cleanup failed: {source_e}")
+    
+    # Pinecone ignores IDs that do not exist
+    potential_ids = [f"{id_prefix}_chunk_{i}" for id_prefix, count in sorted(chunk_counts.items()) for i in range(count)]
+    if not potential_ids:
+        return
+    try:
+        for start in range(0, len(potential_ids), 1000):  # Pinecone deletes at most 1000 IDs per request
+            index.delete(ids=potential_ids[start:start + 1000], namespace=PINECONE_NAMESPACE)
+        logger.info(f"🧹 Attempted ID-based cleanup of {len(potential_ids)} chunk ID(s) for prefixes: {sorted(chunk_counts)}")
+    except Exception as id_e:
+        logger.debug(f"ID-based cleanup failed: {id_e}")
+
 def cleanup_duplicate_vectors(source_filename: str):
     """
     Utility function to clean up all duplicate vectors for a given source file.
@@ -46,65 +90,186 @@ def cleanup_duplicate_vectors(source_filename: str):
         index = create_index()
         
         # Get base filename without extension
-        base_filename = source_filename.split(".")[0] if "." in source_filename else source_filename
-        
-        # Build comprehensive list of all possible source names
-        possible_source_names = set()
-        possible_source_names.add(source_filename)  # Full filename
-        possible_source_names.add(base_filename)    # Base filename
-        
-        # Add variations with different extensions
-        for ext in ['.pdf', '.docx', '.doc', '.txt', '.md', '.xlsx', '.xls', '.csv']:
-            possible_source_names.add(f"{base_filename}{ext}")
-        
-        logger.info(f"Searching for vectors with source names: {list(possible_source_names)}")
-        
-        # Delete vectors for each possible source name
-        total_deleted = 0
-        for source_name in possible_source_names:
-            try:
-                # Query first to count existing vectors
-                query_response = index.query(
-                    vector=[0.0] * 1536,  # Dummy vector for OpenAI embeddings
-                    top_k=10000,  # Large number to get all matches
-                    filter={"source": source_name},
-                    namespace=PINECONE_NAMESPACE,
-                    include_metadata=False
-                )
-                
-                if query_response.matches:
-                    count = len(query_response.matches)
-                    # Delete all vectors with this source
-                    index.delete(
-                        filter={"source": source_name},
-                        namespace=PINECONE_NAMESPACE
-                    )
-                    total_deleted += count
-                    logger.info(f"✅ Deleted {count} vectors for source: {source_name}")
-                    
-            except Exception as source_e:
-                logger.debug(f"No vectors found with source '{source_name}': {source_e}")
-        
-        # Also clean up by ID patterns
-        id_prefixes = {base_filename, source_filename.split(".")[0] if "." in source_filename else source_filename}
-        for id_prefix in id_prefixes:
-            try:
-                # Generate potential IDs and delete them
-                potential_ids = [f"{id_prefix}_chunk_{i}" for i in range(100)]  # Up to 100 chunks
-                index.delete(ids=potential_ids, namespace=PINECONE_NAMESPACE)
-                logger.info(f"🧹 Cleaned up ID patterns for: {id_prefix}")
-            except Exception as id_e:
-                logger.debug(f"ID cleanup for '{id_prefix}': {id_e}")
-        
-        logger.info(f"🎯 Cleanup complete! Total vectors deleted: {total_deleted}")
-        return total_deleted
+        base_filename = file_stem(source_filename)
         
+        # Build comprehensive list of all possible source names: the full filename,
+        # the base filename and variations with different extensions
+        possible_source_names = {source_filename, base_filename} | {
+            f"{base_filename}{ext}" for ext in LEGACY_SOURCE_EXTENSIONS
+        }
+        
+        logger.info(f"Deleting vectors with source names: {list(possible_source_names)}")
+        
+        # Also clean up by ID patterns, including the first-dot prefix older ingests used
+        # for names containing dots; stored chunk counts bound the IDs (up to 100 if unknown)
+        id_prefixes = {base_filename, source_filename.split(".")[0]}
+        chunk_counts = estimate_chunk_counts(id_prefixes, fetch_first_chunk_metadata(index, id_prefixes), 100)
+        delete_document_vectors(index, possible_source_names, chunk_counts)
+        
+        logger.info(f"🎯 Cleanup complete for: {source_filename}")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
         raise
 
-embeddings = OpenAIEmbeddings(api_key=openai_api_key, 
-                              model=EMBEDDING_MODEL_NAME)
+# Batch sizes for ingestion: texts per embeddings request and vectors per Pinecone upsert.
+# 256 chunks of at most CHUNK_SIZE_TOKENS stay under OpenAI's 300k tokens-per-request limit.
+EMBEDDING_BATCH_SIZE = 256
+UPSERT_BATCH_SIZE = 100
+EMBEDDING_MAX_CONCURRENCY = 5  # Embedding batches in flight at once, to avoid 429s
+UPSERT_MAX_CONCURRENCY = PINECONE_UPSERT_CONCURRENCY  # Pinecone upsert batches in flight at once
+
+EMBEDDING_REQUEST_TIMEOUT = 60  # Seconds before a single embeddings request is retried
+
+# Embeddings client shared by every ingest and worker thread, so its HTTP connection
+# pool stays warm instead of being rebuilt per import or per request
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+def get_embeddings():
+    """Get the ingestion embeddings client with lazy, thread-safe initialization."""
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                _embeddings = OpenAIEmbeddings(api_key=openai_api_key,
+                                               model=EMBEDDING_MODEL_NAME,
+                                               dimensions=EMBEDDING_REQUEST_DIMENSIONS,
+                                               chunk_size=EMBEDDING_BATCH_SIZE,
+                                               max_retries=6,
+                                               timeout=EMBEDDING_REQUEST_TIMEOUT)
+    return _embeddings
+
+# Vector store shared by every ingest; create_index() caches the index handle itself,
+# so repeated ingests reuse the client's warm connection pool
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+# Upserts go through the gRPC index when pinecone[grpc] is installed; reads and deletes use REST
+_write_index = None
+_write_index_lock = threading.Lock()
+
+def get_write_index():
+    """Get the Pinecone index handle used for upserts with lazy, thread-safe initialization."""
+    global _write_index
+    if _write_index is None:
+        with _write_index_lock:
+            if _write_index is None:
+                _write_index = create_grpc_index()
+    return _write_index
+
+def get_vector_store():
+    """Get the PineconeVectorStore over the shared index with lazy, thread-safe initialization."""
+    global _vector_store
+    if _vector_store is None:
+        # Imported on first use; only ingestion needs it, so it stays off the server's startup path
+        from langchain_pinecone import PineconeVectorStore
+        index = create_index()
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = PineconeVectorStore(
+                    index=index,
+                    embedding=get_embeddings(),
+                    namespace=PINECONE_NAMESPACE
+                )
+    return _vector_store
+
+# Chunk sizes are measured in embedding-model tokens so token-dense text (URLs, code,
+# tables) can never produce a chunk over the embedding input limit
+CHUNK_SIZE_TOKENS = 1000  # About 4000 characters of prose
+CHUNK_OVERLAP_TOKENS = 50
+EMBEDDING_TOKEN_ENCODING = "cl100k_base"  # Tokenizer of the text-embedding-3 models
+
+# Text splitter for large documents; it holds no per-document state, so one instance is shared
+_text_splitter = None
+
+def get_text_splitter():
+    """Get the token-aware text splitter with lazy initialization (loads the tiktoken encoding)."""
+    global _text_splitter
+    if _text_splitter is None:
+        # Imported on first use, like the tiktoken encoding it loads
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        _text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            encoding_name=EMBEDDING_TOKEN_ENCODING,
+            chunk_size=CHUNK_SIZE_TOKENS,
+            chunk_overlap=CHUNK_OVERLAP_TOKENS,
+            separators=["\n\n", "\n", " ", ""]
+        )
+    return _text_splitter
+
+# Parsed documents are markdown, so chunks follow its sections: headers up to this
+# level start a new section, and adjacent small sections are packed into one chunk
+_MARKDOWN_HEADER = re.compile(r"^ {0,3}(#{1,3})[ \t]+\S")
+MARKDOWN_SECTION_MAX_CHARS = 4000  # About CHUNK_SIZE_TOKENS of prose
+
+def split_markdown_sections(text_content: str):
+    """
+    Split markdown at its headers in a single pass over the lines.
+    Header-like lines inside fenced code blocks are ignored.
+    
+    Args:
+        text_content: Markdown text
+        
+    Returns:
+        List of (enclosing headers, section text) tuples, where enclosing headers are
+        the lines of the parent headers of the section's own header, outermost first
+    """
+    sections = []
+    open_headers = []  # (level, header line) of the headers enclosing the current line
+    section_parents = ()
+    section_start = 0
+    offset = 0
+    in_fence = False
+    for line in text_content.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = _MARKDOWN_HEADER.match(line)
+            if match:
+                if offset > section_start:
+                    sections.append((section_parents, text_content[section_start:offset]))
+                level = len(match.group(1))
+                open_headers = [header for header in open_headers if header[0] < level]
+                section_parents = tuple(header_line for _, header_line in open_headers)
+                open_headers.append((level, stripped))
+                section_start = offset
+        offset += len(line)
+    if offset > section_start:
+        sections.append((section_parents, text_content[section_start:offset]))
+    return sections
+
+def split_document_text(text_content: str):
+    """
+    Split a parsed document into chunks along its markdown sections.
+    Adjacent sections are packed together up to MARKDOWN_SECTION_MAX_CHARS, and only
+    blocks over the token limit are split further by the token-aware text splitter.
+    Each chunk is prefixed with the headers enclosing its first section so it keeps
+    its place in the document.
+    
+    Args:
+        text_content: Document text (plain text is a single section)
+        
+    Returns:
+        List of chunk texts
+    """
+    blocks = []
+    for parents, section in split_markdown_sections(text_content):
+        if not section.strip():
+            continue
+        if blocks and len(blocks[-1][1]) + len(section) <= MARKDOWN_SECTION_MAX_CHARS:
+            blocks[-1] = (blocks[-1][0], blocks[-1][1] + section)
+        else:
+            blocks.append((parents, section))
+    
+    text_splitter = get_text_splitter()
+    chunks = []
+    for parents, block in blocks:
+        context = "\n".join(parents)
+        for piece in text_splitter.split_text(block):
+            chunks.append(f"{context}\n\n{piece}" if context else piece)
+    return chunks
+
+EXCEL_CSV_EXTENSIONS = frozenset(EXCEL_EXTENSIONS + CSV_EXTENSIONS)
 
 def is_excel_csv_file(file_name: str) -> bool:
     """
@@ -116,17 +281,112 @@ def is_excel_csv_file(file_name: str) -> bool:
     Returns:
         True if file is Excel or CSV, False otherwise
     """
-    if not file_name:
-        return False
+    # Called several times per ingest, so the suffix is sliced off the string
+    # instead of building a Path
+    _, dot, extension = (file_name or "").rpartition(".")
+    return bool(dot) and f".{extension.lower()}" in EXCEL_CSV_EXTENSIONS
+
+def find_original_filename(base_filename: str, uploaded_files=None):
+    """
+    Find the uploaded file (with its extension) that a parsed file came from.
     
-    extension = Path(file_name).suffix.lower()
-    excel_csv_extensions = ['.xlsx', '.xls', '.csv']
-    return extension in excel_csv_extensions
+    Args:
+        base_filename: Filename without extension
+        uploaded_files: Optional pre-fetched listing of uploaded_files
+        
+    Returns:
+        The uploaded filename, or None if no uploaded file matches
+    """
+    # Look for the original file with any extension; matching whole stems means
+    # "Sample1" never picks up "Sample1.v2.pdf"
+    if uploaded_files is None:
+        return file_manager.resolve_by_stem(base_filename)
+    return map_files_by_stem(uploaded_files).get(base_filename)
+
+def resolve_source_filename(base_filename: str, uploaded_files=None):
+    """
+    Resolve the source name a parsed file is indexed under.
+    
+    Args:
+        base_filename: Filename without extension
+        uploaded_files: Optional pre-fetched listing of uploaded_files
+        
+    Returns:
+        The uploaded filename, or base_filename with a .md extension if the upload
+        no longer exists (e.g. it was deleted after parsing)
+    """
+    original_filename = find_original_filename(base_filename, uploaded_files)
+    if not original_filename:
+        original_filename = f"{base_filename}.md"
+        logger.warning(f"Could not find original uploaded file for {base_filename}, using {original_filename} as source")
+    return original_filename
 
 def calculate_metadata_size(metadata):
     """Calculate the size of metadata in bytes when JSON serialized."""
+    if orjson:
+        try:
+            return len(orjson.dumps(metadata))
+        except TypeError:
+            # Types orjson does not serialize natively (e.g. sets) go through the standard library
+            pass
     return len(json.dumps(metadata).encode('utf-8'))
 
+# Metadata whose estimated size is within this many bytes of a limit is measured exactly
+METADATA_SIZE_MARGIN = 5000
+
+def estimate_metadata_size(metadata):
+    """
+    Cheaply estimate the JSON size of flat metadata without serializing it.
+    The estimate errs high (ASCII text counts 2 bytes per character to cover
+    escapes, other text 12 to cover \\u escapes of surrogate pairs), so it can
+    be used to skip exact measurement for metadata well under a limit.
+    
+    Returns:
+        Estimated size in bytes, or None if the metadata has nested values
+    """
+    size = 2
+    for key, value in metadata.items():
+        if isinstance(value, str):
+            value_size = 2 * len(value) if value.isascii() else 12 * len(value)
+        elif value is None or isinstance(value, (bool, int, float)):
+            value_size = 24
+        else:
+            return None
+        size += len(key) + value_size + 6
+    return size
+
+def metadata_may_exceed(metadata, limit, estimated_size=None):
+    """
+    Check whether metadata might exceed limit bytes, serializing only when the estimate is close.
+    A caller that already has the estimate_metadata_size result can pass it as estimated_size.
+    """
+    if estimated_size is None:
+        estimated_size = estimate_metadata_size(metadata)
+    if estimated_size is not None and estimated_size <= limit - METADATA_SIZE_MARGIN:
+        return False
+    return calculate_metadata_size(metadata) > limit
+
+# Upper bound on the serialized size of the per-chunk fields: chunk_id, chunk_size and the "text" key
+CHUNK_FIELDS_SIZE = 100
+
+def find_oversized_records(metadatas, texts, limit=40000):
+    """
+    Find chunks whose stored metadata, including the chunk text, exceeds limit bytes.
+    All sizes are measured in one pass; chunk fields are small and fixed, so
+    normally nothing is returned and no per-chunk truncation runs.
+    
+    Args:
+        metadatas: Metadata of each chunk
+        texts: Text of each chunk, stored alongside its metadata
+        limit: Size limit in bytes
+        
+    Returns:
+        Indices of the oversized chunks
+    """
+    sizes = [calculate_metadata_size(metadata) + len(text.encode('utf-8'))
+             for metadata, text in zip(metadatas, texts)]
+    return [i for i, size in enumerate(sizes) if size > limit]
+
 def truncate_metadata(metadata, max_size=35000):  # Leave buffer under 40KB limit
     """Truncate metadata fields to fit within Pinecone's size limits."""
     # Create a copy to avoid modifying the original
@@ -137,50 +397,168 @@ def truncate_metadata(metadata, max_size=35000):  # Leave buffer under 40KB limi
     
     for field in fields_to_check:
         if field in truncated_metadata:
-            field_value = str(truncated_metadata[field])
+            field_value = truncated_metadata[field]
+            if not isinstance(field_value, str):
+                field_value = str(field_value)
             # If this field exists and is large, truncate it
             if len(field_value) > 1000:  # If field is large
                 truncated_metadata[field] = field_value[:500] + "... [truncated]"
     
     # Check final size and remove non-essential fields if still too large
-    current_size = calculate_metadata_size(truncated_metadata)
-    if current_size > max_size:
+    if metadata_may_exceed(truncated_metadata, max_size):
         # Keep only essential fields
-        essential_fields = ['source', 'chunk_id', 'total_chunks']
+        essential_fields = ['source', 'chunk_id', 'total_chunks', 'content_hash']
+        dropped_fields = [k for k in truncated_metadata if k not in essential_fields]
+        logger.warning(f"Metadata too large, dropping non-essential fields: {dropped_fields}")
         truncated_metadata = {k: v for k, v in truncated_metadata.items() 
                             if k in essential_fields}
     
     return truncated_metadata
 
-def ingest_documents_to_pinecone_hybrid(file_name: str):
+def estimate_chunk_counts(id_prefixes, first_chunks, default_count: int):
+    """
+    Work out how many chunk IDs to delete under each candidate ID prefix.
+    
+    Args:
+        id_prefixes: Chunk ID prefixes the document may have been stored under
+        first_chunks: fetch_first_chunk_metadata result for those prefixes (None if unknown)
+        default_count: Count used when a prefix's stored chunk count is unknown
+        
+    Returns:
+        Dictionary mapping each prefix to a chunk count; prefixes with no first chunk get 0
+    """
+    chunk_counts = {}
+    for id_prefix in id_prefixes:
+        if first_chunks is None:
+            chunk_counts[id_prefix] = default_count
+        elif id_prefix not in first_chunks:
+            chunk_counts[id_prefix] = 0  # Chunk IDs start at 0, so nothing is stored under this prefix
+        elif "total_chunks" in first_chunks[id_prefix]:
+            chunk_counts[id_prefix] = int(first_chunks[id_prefix]["total_chunks"])
+        else:
+            chunk_counts[id_prefix] = default_count
+    return chunk_counts
+
+def fetch_first_chunk_metadata(index, id_bases):
+    """
+    Fetch the first chunk of a previously ingested document under each candidate ID prefix,
+    in a single request. A first chunk carries the document-wide fields, such as
+    total_chunks and content_hash.
+    
+    Args:
+        index: Pinecone index
+        id_bases: Chunk ID prefixes the document may be stored under
+        
+    Returns:
+        Dictionary mapping each prefix that has a first chunk to that chunk's metadata,
+        or None if the fetch failed and it is unknown whether the document exists
+    """
+    first_chunk_ids = {f"{id_base}_chunk_0": id_base for id_base in id_bases}
+    try:
+        fetch_response = index.fetch(ids=list(first_chunk_ids), namespace=PINECONE_NAMESPACE)
+    except Exception as fetch_e:
+        logger.debug(f"Could not fetch existing chunks {list(first_chunk_ids)}: {fetch_e}")
+        return None
+    return {
+        first_chunk_ids[vector_id]: vector.metadata or {}
+        for vector_id, vector in fetch_response.vectors.items()
+        if vector_id in first_chunk_ids
+    }
+
+def compute_content_hash(text_content: str, metadata: dict) -> str:
+    """
+    Hash everything that determines a document's vectors: its text, its metadata,
+    and the chunking and embedding settings.
+    
+    Args:
+        text_content: Document text
+        metadata: Document metadata (including the resolved source)
+        
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{EMBEDDING_MODEL_NAME}|{CHUNK_SIZE_TOKENS}|{CHUNK_OVERLAP_TOKENS}|".encode('utf-8'))
+    digest.update(repr(sorted(metadata.items(), key=lambda item: item[0])).encode('utf-8'))
+    digest.update(text_content.encode('utf-8'))
+    return digest.hexdigest()
+
+def embed_and_upsert(index, texts, metadatas, ids):
+    """
+    Embed chunks and upsert them to Pinecone as a pipeline: each embedding batch
+    is upserted as soon as it returns, while later batches are still embedding.
+    Up to EMBEDDING_MAX_CONCURRENCY embedding requests and UPSERT_MAX_CONCURRENCY
+    upserts are in flight at once, and only unfinished batches hold their vectors.
+    Each chunk's text is stored under the "text" metadata key, matching the
+    layout PineconeVectorStore uses so the retrievers can read it back.
+    
+    The first chunk carries the document's content hash, so it is upserted only
+    after every other batch has succeeded. If any batch fails, the stored hash
+    stays stale and the next ingest redoes the whole document.
+    
+    Args:
+        index: Pinecone index to upsert into (REST or gRPC)
+        texts: Chunk texts
+        metadatas: Metadata of each chunk
+        ids: Vector ID of each chunk
+    """
+    batch_starts = range(0, len(texts), EMBEDDING_BATCH_SIZE)
+    logger.info(f"Embedding and upserting {len(texts)} chunks in {len(batch_starts)} batch(es)")
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(EMBEDDING_MAX_CONCURRENCY, len(batch_starts)))) as embed_executor, \
+            ThreadPoolExecutor(max_workers=UPSERT_MAX_CONCURRENCY) as upsert_executor:
+        # Tag each embedding batch with its start offset so results map back to their chunks
+        embed_futures = {
+            embed_executor.submit(get_embeddings().embed_documents, texts[start:start + EMBEDDING_BATCH_SIZE]): start
+            for start in batch_starts
+        }
+        upsert_futures = []
+        first_record = None
+        for future in as_completed(embed_futures):
+            start = embed_futures[future]
+            records = [
+                {"id": ids[start + offset], "values": vector,
+                 "metadata": {**metadatas[start + offset], "text": texts[start + offset]}}
+                for offset, vector in enumerate(future.result())
+            ]
+            if start == 0:
+                first_record = records.pop(0)
+            for upsert_start in range(0, len(records), UPSERT_BATCH_SIZE):
+                upsert_futures.append(upsert_executor.submit(
+                    index.upsert, vectors=records[upsert_start:upsert_start + UPSERT_BATCH_SIZE],
+                    namespace=PINECONE_NAMESPACE))
+        # Surface the first failed upsert, if any
+        for future in upsert_futures:
+            future.result()
+    
+    if first_record is not None:
+        index.upsert(vectors=[first_record], namespace=PINECONE_NAMESPACE)
+
+def ingest_documents_to_pinecone_hybrid(file_name: str, text_content: str = None, metadata: dict = None,
+                                        original_filename: str = None):
     """
     This function ingests documents to Pinecone with upsert functionality and proper chunking.
     If the document already exists, it will be updated with new content.
     Documents are split into chunks to avoid Pinecone metadata size limits.
+    
+    Args:
+        file_name: Name of the parsed file to ingest
+        text_content: Optional pre-loaded document text (loaded from storage if omitted)
+        metadata: Optional pre-loaded document metadata, used with text_content
+        original_filename: Optional pre-resolved uploaded filename (looked up if omitted)
     """
     try:
-        logger.info(f"Loading content for file: {file_name}")
-        text_content, metadata = load_edited_file_or_parsed_file(file_name)
+        if text_content is None:
+            logger.info(f"Loading content for file: {file_name}")
+            text_content, metadata = load_edited_file_or_parsed_file(file_name)
+        metadata = dict(metadata or {})
 
         # Use consistent ID generation based on the source file
-        base_filename = file_name.split(".")[0] if "." in file_name else file_name
+        base_filename = file_stem(file_name)
         
         # Determine the original source filename with proper extension
-        # Check if we have the original filename in uploaded_files to get the correct extension
-        original_filename = None
-        uploaded_files = file_manager.list_files("uploaded_files")
-        
-        # Look for the original file with any extension
-        for uploaded_file in uploaded_files:
-            if uploaded_file.startswith(base_filename + "."):
-                original_filename = uploaded_file
-                break
-        
-        # If we can't find the original file, use the base filename with .md extension
-        # This handles cases where the original file might have been deleted
         if not original_filename:
-            original_filename = f"{base_filename}.md"
-            logger.warning(f"Could not find original uploaded file for {base_filename}, using {original_filename} as source")
+            original_filename = resolve_source_filename(base_filename)
         
         # Update metadata to include proper source for filtering
         # Always use the original filename (not temporary paths or base names)
@@ -188,196 +566,196 @@ def ingest_documents_to_pinecone_hybrid(file_name: str):
         metadata["source"] = original_filename
         logger.info(f"Updated source metadata: '{old_source}' -> '{original_filename}'")
         
-        # Initialize text splitter for large documents
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=4000,  # Smaller chunks to avoid metadata size issues
-            chunk_overlap=200,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        
-        # Split the document into chunks
-        chunks = text_splitter.split_text(text_content)
-        logger.info(f"Split document into {len(chunks)} chunks")
+        # Use original filename base for consistent ID generation
+        id_base = file_stem(original_filename)
         
-        # Create documents for each chunk with proper metadata
-        documents = []
-        document_ids = []
-        
-        for i, chunk in enumerate(chunks):
-            # Create chunk-specific metadata
-            chunk_metadata = metadata.copy()
-            chunk_metadata.update({
-                "chunk_id": i,
-                "total_chunks": len(chunks),
-                "chunk_size": len(chunk)
-            })
-            
-            # Truncate metadata to ensure it fits within Pinecone limits
-            chunk_metadata = truncate_metadata(chunk_metadata)
-            
-            # Verify metadata size
-            metadata_size = calculate_metadata_size(chunk_metadata)
-            if metadata_size > 40000:  # 40KB limit
-                logger.warning(f"Chunk {i} metadata still too large ({metadata_size} bytes), further truncating...")
-                # Emergency truncation - keep only essential fields
-                chunk_metadata = {
-                    "source": original_filename,  # Use original_filename instead of file_name
-                    "chunk_id": i,
-                    "total_chunks": len(chunks)
-                }
-            
-            # Create document and ID for this chunk using consistent naming
-            doc = Document(page_content=chunk, metadata=chunk_metadata)
-            documents.append(doc)
-            
-            # Use original filename base for consistent ID generation
-            id_base = original_filename.split(".")[0] if "." in original_filename else original_filename
-            document_ids.append(f"{id_base}_chunk_{i}")
-
-        logger.info("Creating/accessing Pinecone index...")
+        logger.info("Accessing Pinecone index...")
         index = create_index()
-
-        # Enhanced duplicate prevention: Delete ALL possible variations of this document
-        logger.info(f"Performing comprehensive cleanup for document: {file_name}")
         
-        # Build list of all possible source names this document might have been stored under
-        possible_source_names = set()
-        
-        # Add the current source name (with extension)
-        possible_source_names.add(original_filename)
+        # Skip re-embedding entirely when the stored vectors were built from identical content
+        content_hash = compute_content_hash(text_content, metadata)
+        # Probe the current ID prefix and the ones older ingests may have used (including the
+        # first-dot prefixes used for names containing dots) in one fetch
+        possible_id_prefixes = {
+            id_base,
+            base_filename,
+            file_name.split(".")[0],
+            original_filename.split(".")[0]
+        }
+        first_chunks = fetch_first_chunk_metadata(index, possible_id_prefixes)
+        existing_metadata = first_chunks.get(id_base) if first_chunks else None
+        if existing_metadata and existing_metadata.get("content_hash") == content_hash:
+            logger.info(f"⏭️ Content of {file_name} is unchanged since the last ingest, skipping Pinecone upload")
+            return get_vector_store()
         
-        # Add base filename (without extension) for legacy compatibility
-        possible_source_names.add(base_filename)
+        # Split the document into chunks
+        chunks = split_document_text(text_content)
+        logger.info(f"Split document into {len(chunks)} chunks")
         
-        # Add the passed filename as-is
-        if file_name not in possible_source_names:
-            possible_source_names.add(file_name)
-            
-        # If original filename is different from file_name, add that too
-        if original_filename != file_name:
-            base_original = original_filename.split(".")[0] if "." in original_filename else original_filename
-            possible_source_names.add(base_original)
-        
-        # Add common extensions that might have been used
-        file_base = base_filename
-        for ext in ['.pdf', '.docx', '.doc', '.txt', '.md', '.xlsx', '.xls', '.csv']:
-            possible_source_names.add(f"{file_base}{ext}")
-        
-        logger.info(f"Checking for existing vectors with source names: {list(possible_source_names)}")
-        
-        # Delete vectors for each possible source name
-        deleted_count = 0
-        for source_name in possible_source_names:
-            try:
-                # Query first to see if vectors exist with this source
-                query_response = index.query(
-                    vector=[0.0] * 1536,  # Dummy vector for OpenAI embeddings
-                    top_k=1,
-                    filter={"source": source_name},
-                    namespace=PINECONE_NAMESPACE,
-                    include_metadata=True
-                )
-                
-                if query_response.matches:
-                    # Delete vectors with this source
-                    index.delete(
-                        filter={"source": source_name},
-                        namespace=PINECONE_NAMESPACE
-                    )
-                    deleted_count += len(query_response.matches)
-                    logger.info(f"✅ Deleted existing vectors for source: {source_name}")
-                else:
-                    logger.debug(f"No existing vectors found for source: {source_name}")
-                    
-            except Exception as source_e:
-                logger.debug(f"No vectors found with source '{source_name}': {source_e}")
-        
-        if deleted_count > 0:
-            logger.info(f"🧹 Total cleanup: Deleted {deleted_count} existing vector(s) to prevent duplicates")
+        # Metadata shared by all chunks is truncated once to fit within Pinecone limits;
+        # the per-chunk fields added below are small integers. If it is still too large,
+        # truncate_metadata keeps only the essential fields (the source filename, two
+        # integers and a 64-character hash), which are far below the limit.
+        base_metadata = truncate_metadata({**metadata, "total_chunks": len(chunks), "content_hash": content_hash})
+        base_size = estimate_metadata_size(base_metadata)
+        
+        # Build the upsert payload directly as parallel lists of texts, metadata and IDs;
+        # embed_and_upsert zips them into Pinecone records, so no Document objects are needed
+        chunk_lengths = [len(chunk) for chunk in chunks]
+        metadatas = [{**base_metadata, "chunk_id": i, "chunk_size": chunk_size}
+                     for i, chunk_size in enumerate(chunk_lengths)]
+        document_ids = [f"{id_base}_chunk_{i}" for i in range(len(chunks))]
+        
+        # The chunk text is stored in the same metadata, so the final records are checked too.
+        # Usually the largest possible record (4 UTF-8 bytes per character of the longest chunk)
+        # is far below the limit and no record needs measuring.
+        if base_size is None or base_size + 4 * max(chunk_lengths, default=0) + CHUNK_FIELDS_SIZE > 40000 - METADATA_SIZE_MARGIN:
+            for i in find_oversized_records(metadatas, chunks):
+                logger.warning(f"Chunk {i} metadata plus text exceeds the Pinecone limit, truncating metadata")
+                metadatas[i] = truncate_metadata(metadatas[i], max_size=35000 - len(chunks[i].encode('utf-8')))
+
+        # Chunk IDs are deterministic, so re-ingesting a document that was stored under
+        # the current naming overwrites its chunks in place; only surplus chunks from
+        # a longer previous version need deleting
+        if existing_metadata and "total_chunks" in existing_metadata:
+            existing_total_chunks = int(existing_metadata["total_chunks"])
+            surplus_ids = [f"{id_base}_chunk_{i}" for i in range(len(chunks), existing_total_chunks)]
+            if surplus_ids:
+                index.delete(ids=surplus_ids, namespace=PINECONE_NAMESPACE)
+                logger.info(f"🧹 Deleted {len(surplus_ids)} surplus chunk(s) from the previous version")
+            else:
+                logger.info(f"Existing document has {existing_total_chunks} chunk(s), upsert will overwrite them")
         else:
-            logger.info("No existing vectors found to delete")
+            # Enhanced duplicate prevention: Delete ALL possible variations of this document
+            logger.info(f"Performing comprehensive cleanup for document: {file_name}")
             
-        # Additionally, delete by consistent ID pattern to catch any missed vectors
-        try:
-            # Generate all possible IDs that might exist for this document
-            possible_id_prefixes = set()
-            possible_id_prefixes.add(base_filename)
-            possible_id_prefixes.add(file_name.split(".")[0] if "." in file_name else file_name)
-            if original_filename:
-                possible_id_prefixes.add(original_filename.split(".")[0] if "." in original_filename else original_filename)
+            # Build list of all possible source names this document might have been stored under:
+            # the current source name, the base filename (legacy), the passed filename as-is,
+            # the original filename's base and the base with common extensions
+            possible_source_names = {original_filename, base_filename, file_name, id_base} | {
+                f"{base_filename}{ext}" for ext in LEGACY_SOURCE_EXTENSIONS
+            }
             
-            for id_prefix in possible_id_prefixes:
-                try:
-                    # Generate potential IDs for chunks (assuming up to 50 chunks max)
-                    potential_ids = [f"{id_prefix}_chunk_{i}" for i in range(50)]
-                    
-                    # Try to delete these IDs (Pinecone will ignore non-existent ones)
-                    index.delete(ids=potential_ids, namespace=PINECONE_NAMESPACE)
-                    logger.info(f"🧹 Attempted ID-based cleanup for prefix: {id_prefix}")
-                    
-                except Exception as id_e:
-                    logger.debug(f"ID cleanup for prefix '{id_prefix}' completed: {id_e}")
-                    
-        except Exception as id_cleanup_e:
-            logger.debug(f"ID-based cleanup failed: {id_cleanup_e}")
-
-        logger.info(f"Uploading {len(documents)} document chunks to Pinecone...")
-        
-        # Create vector store and add documents with consistent IDs
-        vector_store = PineconeVectorStore(
-            index=index,
-            embedding=embeddings,
-            namespace=PINECONE_NAMESPACE
-        )
+            logger.info(f"Deleting existing vectors with source names: {list(possible_source_names)}")
+            
+            # Also delete by consistent ID pattern to catch any missed vectors, bounded by each
+            # prefix's stored chunk count (or a margin over the new count when it is unknown).
+            # When no prefix has a first chunk, there are no deterministic IDs to delete, but
+            # versions that stored chunks under random UUIDs are still reached by the source filter.
+            if first_chunks == {}:
+                chunk_counts = {}
+            else:
+                chunk_counts = estimate_chunk_counts(possible_id_prefixes, first_chunks, len(chunks) + 10)
+            delete_document_vectors(index, possible_source_names, chunk_counts)
+
+        logger.info(f"Uploading {len(chunks)} document chunks to Pinecone...")
         
-        # Add documents with consistent IDs to enable upsert behavior
-        vector_store.add_documents(documents=documents, ids=document_ids)
+        # Upsert with consistent IDs to enable upsert behavior
+        embed_and_upsert(get_write_index(), chunks, metadatas, document_ids)
         
-        logger.info(f"Successfully uploaded/updated {len(documents)} chunks for document: {file_name}")
-        return vector_store
+        logger.info(f"Successfully uploaded/updated {len(chunks)} chunks for document: {file_name}")
+        return get_vector_store()
     except Exception as e:
         logger.error(f"Error while ingesting documents: {str(e)}")
         raise
 
-def create_bm25_index(file_name: str):
+STEM_CACHE_SIZE = 100_000  # Distinct words whose stems are kept across BM25 fits
+
+class _MemoizedStemmer:
+    """Stemmer wrapper that stems each distinct word once; documents repeat most words many times."""
+    
+    def __init__(self, stemmer):
+        self.stem = functools.lru_cache(maxsize=STEM_CACHE_SIZE)(stemmer.stem)
+
+# Unfitted encoder that every BM25 fit starts from. Constructing a BM25Encoder loads the
+# NLTK stopwords and stemmer, so it is built once and shallow-copied per fit; the copies
+# share its tokenizer, whose stem cache then stays warm across documents. fit() assigns
+# new parameters rather than mutating shared ones, so concurrent ingests are safe.
+_bm25_template = None
+
+def new_bm25_encoder():
+    """
+    Create an unfitted BM25Encoder whose tokenizer memoizes word stems.
+    Stemming runs in pure Python for every token and dominates fit time, while
+    tokenization and term hashing stay exactly as BM25Encoder does them, so
+    query encoding still matches the fitted document frequencies.
+    
+    Returns:
+        An unfitted BM25Encoder
+    """
+    global _bm25_template
+    if _bm25_template is None:
+        encoder = BM25Encoder()
+        tokenizer = getattr(encoder, "_tokenizer", None)
+        stemmer = getattr(tokenizer, "_stemmer", None)
+        if stemmer is not None:
+            tokenizer._stemmer = _MemoizedStemmer(stemmer)
+        _bm25_template = encoder
+    return copy.copy(_bm25_template)
+
+BM25_INDEX_COMPRESSION_LEVEL = 3
+
+def compute_bm25_content_hash(text_content: str) -> str:
+    """Hash the text a BM25 index is fitted on; stored in a sidecar file next to the index."""
+    return hashlib.blake2b(text_content.encode('utf-8'), digest_size=16).hexdigest()
+
+def bm25_index_is_current(base_filename: str, content_hash: str) -> bool:
+    """
+    Check whether the stored BM25 index of a document was fitted on the same content.
+    
+    Args:
+        base_filename: Base name of the document
+        content_hash: Hash of the document's current content
+        
+    Returns:
+        True if the index exists and its sidecar hash matches
+    """
+    try:
+        stored_hash = file_manager.load_file(BM25_INDEXES_PATH, f"{base_filename}.hash").strip()
+    except Exception:
+        return False
+    return stored_hash == content_hash and file_manager.file_exists(BM25_INDEXES_PATH, f"{base_filename}.json.gz")
+
+def create_bm25_index(file_name: str, text_content: str = None, original_filename: str = None):
     """
     This function creates a new BM25 index and saves it using the file manager.
-    If an index already exists for the file, it will be overwritten.
+    If an index already exists for the file, it will be overwritten, unless it was
+    fitted on identical content, in which case fitting and saving are skipped.
     BM25 works with the full document content (not chunked) for better keyword matching.
+    
+    Args:
+        file_name: Name of the parsed file to index
+        text_content: Optional pre-loaded document text (loaded from storage if omitted)
+        original_filename: Optional pre-resolved uploaded filename (looked up if omitted)
+        
+    Returns:
+        The fitted BM25Encoder, or None when the stored index is already up to date
     """
     try:
         logger.info(f"Creating BM25 index for file: {file_name}")
         
         # Use base filename without extension for consistency
-        from pathlib import Path as FilePath
-        base_filename = FilePath(file_name).stem
-        index_filename = f"{base_filename}.json"
+        base_filename = file_stem(file_name)
+        index_filename = f"{base_filename}.json.gz"
         
         # Determine the original source filename (same logic as Pinecone ingestion)
-        original_filename = None
-        uploaded_files = file_manager.list_files("uploaded_files")
-        
-        # Look for the original file with any extension
-        for uploaded_file in uploaded_files:
-            if uploaded_file.startswith(base_filename + "."):
-                original_filename = uploaded_file
-                break
-        
-        # If we can't find the original file, use the base filename with .md extension
         if not original_filename:
-            original_filename = f"{base_filename}.md"
-            logger.warning(f"Could not find original uploaded file for {base_filename}, using {original_filename} as source")
+            original_filename = resolve_source_filename(base_filename)
         
         # Load the document content
-        text_content, metadata = load_edited_file_or_parsed_file(file_name)
+        if text_content is None:
+            text_content, _ = load_edited_file_or_parsed_file(file_name)
         
-        # Update metadata to include proper source for filtering
-        metadata["source"] = original_filename
         logger.info(f"Using source metadata: {original_filename}")
         
+        # Skip the fit and upload when the stored index was built from the same content
+        content_hash = compute_bm25_content_hash(text_content)
+        if bm25_index_is_current(base_filename, content_hash):
+            logger.info(f"BM25 cache hit: index for {file_name} is up to date, skipping re-fit")
+            return None
+        
         # Create BM25 encoder with the document content
-        encoder = BM25Encoder()
+        encoder = new_bm25_encoder()
         
         # BM25Encoder expects a list of strings (the corpus)
         # We pass the text content directly as a list of strings
@@ -395,11 +773,25 @@ def create_bm25_index(file_name: str):
             'b': encoder.b
         }
         
-        # Convert to JSON string
-        encoder_content = json.dumps(encoder_data, indent=2)
+        # Serialize to compact JSON bytes in memory; indentation only inflated
+        # the upload and the parse on every retriever load
+        if orjson:
+            encoder_content = orjson.dumps(encoder_data, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            encoder_content = json.dumps(encoder_data, separators=(',', ':')).encode('utf-8')
+        
+        # Token hashes and counts compress several-fold; a low level keeps compression fast
+        encoder_content = gzip.compress(encoder_content, compresslevel=BM25_INDEX_COMPRESSION_LEVEL)
         
         # Save the encoder using the file manager
-        saved_path = file_manager.save_file(BM25_INDEXES_PATH, index_filename, encoder_content)
+        saved_path = file_manager.save_binary_file(BM25_INDEXES_PATH, index_filename, encoder_content)
+        file_manager.save_file(BM25_INDEXES_PATH, f"{base_filename}.hash", content_hash)
+        
+        # Remove the uncompressed index from older ingests so the document is not counted twice
+        legacy_filename = f"{base_filename}.json"
+        if file_manager.file_exists(BM25_INDEXES_PATH, legacy_filename):
+            file_manager.delete_file(BM25_INDEXES_PATH, legacy_filename)
+            logger.info(f"Removed uncompressed BM25 index {legacy_filename}")
         
         logger.info(f"Successfully created BM25 index for {file_name} and saved to {saved_path}")
         return encoder
@@ -408,6 +800,46 @@ def create_bm25_index(file_name: str):
         logger.error(f"Error creating BM25 index for {file_name}: {str(e)}")
         raise
 
+def resolve_ingest_source(file_name: str) -> str:
+    """
+    Resolve the uploaded filename a parsed file was produced from.
+    
+    Args:
+        file_name: Name of the parsed file (may lack an extension)
+        
+    Returns:
+        The original uploaded filename
+    """
+    # A name that already carries the Excel/CSV extension needs no storage lookup.
+    # Otherwise look for the original uploaded file to determine its type
+    if is_excel_csv_file(file_name):
+        return file_name
+    return resolve_source_filename(file_stem(file_name))
+
+def excel_csv_ingest_result(file_name: str, original_filename: str) -> dict:
+    """
+    Build the ingestion result for an Excel/CSV file, which is not indexed.
+    
+    Args:
+        file_name: Name of the parsed file
+        original_filename: Name of the uploaded Excel/CSV file
+        
+    Returns:
+        Ingestion result dictionary
+    """
+    logger.info(f"📊 Detected Excel/CSV file: {original_filename} (parsed as {file_name})")
+    logger.info("📊 Excel/CSV files are parsed and saved but NOT indexed to BM25/Pinecone")
+    logger.info("📊 These files use the Pandas agent for natural language queries instead")
+    logger.info("📊 File is ready for use with /querypandas endpoint")
+    
+    return {
+        "pinecone_result": None,
+        "bm25_result": None,
+        "status": "success",
+        "file_type": "excel_csv",
+        "message": f"Excel/CSV file {original_filename} parsed and saved. Use /querypandas for data analysis queries."
+    }
+
 def ingest_documents_to_pinecone_and_bm25(file_name: str):
     """
     Main function to ingest documents to both Pinecone and BM25 indexes.
@@ -419,47 +851,37 @@ def ingest_documents_to_pinecone_and_bm25(file_name: str):
     try:
         logger.info(f"Starting ingestion process for file: {file_name}")
         
-        # Check if this is an Excel/CSV file by looking at the original uploaded file
-        # The file_name parameter might not have extension, so we need to find the original file
-        base_filename = file_name.split(".")[0] if "." in file_name else file_name
-        
-        # Look for the original uploaded file to determine its type
-        uploaded_files = file_manager.list_files("uploaded_files")
-        original_filename = None
-        
-        # Look for the original file with any extension
-        for uploaded_file in uploaded_files:
-            if uploaded_file.startswith(base_filename + "."):
-                original_filename = uploaded_file
-                break
+        # Check if this is an Excel/CSV file by looking at the original uploaded file.
+        # The resolved name is passed to both indexing steps so uploaded_files is listed only once
+        original_filename = resolve_ingest_source(file_name)
         
         # Check if the original file is Excel/CSV
-        if original_filename and is_excel_csv_file(original_filename):
-            logger.info(f"📊 Detected Excel/CSV file: {original_filename} (parsed as {file_name})")
-            logger.info("📊 Excel/CSV files are parsed and saved but NOT indexed to BM25/Pinecone")
-            logger.info("📊 These files use the Pandas agent for natural language queries instead")
-            logger.info("📊 File is ready for use with /querypandas endpoint")
-            
-            return {
-                "pinecone_result": None,
-                "bm25_result": None,
-                "status": "success",
-                "file_type": "excel_csv",
-                "message": f"Excel/CSV file {original_filename} parsed and saved. Use /querypandas for data analysis queries."
-            }
+        if is_excel_csv_file(original_filename):
+            return excel_csv_ingest_result(file_name, original_filename)
         
         # For non-Excel/CSV files, proceed with normal indexing
         logger.info(f"📄 Processing document file: {file_name}")
         
-        # Step 1: Ingest to Pinecone (vector search)
-        logger.info("Step 1: Ingesting to Pinecone for vector search...")
-        pinecone_result = ingest_documents_to_pinecone_hybrid(file_name)
-        logger.info("✅ Pinecone ingestion completed successfully")
+        # Load the document once and share it between both indexes
+        logger.info(f"Loading content for file: {file_name}")
+        text_content, metadata = load_edited_file_or_parsed_file(file_name)
         
-        # Step 2: Create BM25 index (keyword search)
-        logger.info("Step 2: Creating BM25 index for keyword search...")
-        bm25_result = create_bm25_index(file_name)
-        logger.info("✅ BM25 index creation completed successfully")
+        # The two indexes are independent, so the Pinecone upload (network-bound)
+        # and the BM25 fit and save run concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Step 1: Ingest to Pinecone (vector search)
+            logger.info("Step 1: Ingesting to Pinecone for vector search...")
+            pinecone_future = executor.submit(ingest_documents_to_pinecone_hybrid, file_name, text_content,
+                                              metadata, original_filename)
+            
+            # Step 2: Create BM25 index (keyword search)
+            logger.info("Step 2: Creating BM25 index for keyword search...")
+            bm25_future = executor.submit(create_bm25_index, file_name, text_content, original_filename)
+            
+            pinecone_result = pinecone_future.result()
+            logger.info("✅ Pinecone ingestion completed successfully")
+            bm25_result = bm25_future.result()
+            logger.info("✅ BM25 index creation completed successfully")
         
         logger.info(f"🎉 Complete ingestion process finished for {file_name}")
         logger.info("Document is now searchable via both vector (Pinecone) and keyword (BM25) search")
@@ -1,9 +1,14 @@
 import os
 from dotenv import load_dotenv
 import pinecone
-from langchain_openai import OpenAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
 import logging
+import threading
+
+# The gRPC client (pinecone[grpc]) upserts faster than REST; fall back to REST without it
+try:
+    from pinecone.grpc import PineconeGRPC
+except ImportError:
+    PineconeGRPC = None
 
 logger = logging.getLogger(__name__)
 
@@ -23,18 +28,41 @@ if openai_api_key:
 # Import configuration constants
 from config import PINECONE_INDEX_NAME, PINECONE_NAMESPACE, EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSION
 
-# Initialize OpenAI embeddings
-embeddings = OpenAIEmbeddings(api_key=openai_api_key, 
-                              model=EMBEDDING_MODEL_NAME)
+# Shared Pinecone client so HTTP connection pools and index host lookups are reused
+_pinecone_client = None
+
+def get_pinecone_client():
+    """Get the Pinecone client with lazy initialization."""
+    global _pinecone_client
+    if _pinecone_client is None:
+        _pinecone_client = pinecone.Pinecone(api_key=pinecone_api_key)
+    return _pinecone_client
+
+# Index handle shared by every caller once the index is known to exist, so only the
+# first call pays the list_indexes/describe_index control-plane round trips
+_index = None
+_index_lock = threading.Lock()
 
 def create_index():
+    """
+    Returns the Pinecone index handle, creating or connecting to the index on first use.
+    The handle is cached after the first successful existence check.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _connect_index()
+    return _index
+
+def _connect_index():
     """
     Creates or connects to a Pinecone index for document storage.
     Uses generic configuration constants for index name and namespace.
     """
     try:
         # Initialize Pinecone
-        pc = pinecone.Pinecone(api_key=pinecone_api_key)
+        pc = get_pinecone_client()
         
         # Check if index exists
         existing_indexes = pc.list_indexes()
@@ -45,7 +73,7 @@ def create_index():
             # Create index with proper spec configuration for hybrid search
             pc.create_index(
                 name=PINECONE_INDEX_NAME,
-                dimension=int(EMBEDDING_DIMENSION),  # OpenAI text-embedding-3-large dimension
+                dimension=int(EMBEDDING_DIMENSION),  # Must match the embedding model's output dimension
                 metric="dotproduct",  # Required for hybrid search (dense + sparse)
                 spec=pinecone.ServerlessSpec(
                     cloud="aws",
@@ -60,6 +88,14 @@ def create_index():
             print(f"Index {PINECONE_INDEX_NAME} created successfully")
         else:
             print(f"Using existing index: {PINECONE_INDEX_NAME}")
+            # An index's dimension is fixed at creation; a model or dimension change needs a new index
+            index_dimension = pc.describe_index(PINECONE_INDEX_NAME).dimension
+            if index_dimension != int(EMBEDDING_DIMENSION):
+                raise ValueError(
+                    f"Pinecone index {PINECONE_INDEX_NAME} has dimension {index_dimension} but "
+                    f"{EMBEDDING_MODEL_NAME} is configured for {EMBEDDING_DIMENSION}; set PINECONE_INDEX_NAME "
+                    f"to a new index (it will be created at the configured dimension) or delete the old one"
+                )
         
         return pc.Index(PINECONE_INDEX_NAME)
         
@@ -67,6 +103,25 @@ def create_index():
         logger.error(f"Error creating/connecting to Pinecone index: {e}")
         raise
 
+# Shared gRPC client for the bulk write path
+_pinecone_grpc_client = None
+
+def create_grpc_index():
+    """
+    Connects to the Pinecone index over gRPC for high-throughput upserts.
+    Control-plane calls (creating the index, describing stats, deletes) stay on REST.
+    Falls back to the REST index when the gRPC extra is not installed.
+    """
+    global _pinecone_grpc_client
+    # Make sure the index exists and matches the embedding dimension
+    rest_index = create_index()
+    if PineconeGRPC is None:
+        logger.info("pinecone[grpc] is not installed, using the REST client for upserts")
+        return rest_index
+    if _pinecone_grpc_client is None:
+        _pinecone_grpc_client = PineconeGRPC(api_key=pinecone_api_key)
+    return _pinecone_grpc_client.Index(PINECONE_INDEX_NAME)
+
 def test_pinecone_connection():
     """
     Test the connection to Pinecone and verify index accessibility.
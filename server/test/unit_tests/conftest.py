@@ -0,0 +1,75 @@
+"""
+Shared setup for the unit tests.
+
+Server modules create their storage directories and file manager at import time,
+so they are imported from a temporary working directory in local storage mode.
+Modules whose third-party dependencies are not installed are skipped, as are
+BM25 tests when the NLTK data the encoder tokenizes with is not downloaded.
+
+Run from the server directory: python -m pytest test/unit_tests
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+
+@pytest.fixture(scope="session")
+def workdir(tmp_path_factory):
+    """Run the session from an empty directory with local file storage."""
+    path = tmp_path_factory.mktemp("server")
+    previous_cwd = os.getcwd()
+    previous_mode = os.environ.get("STORAGE_MODE")
+    os.environ["STORAGE_MODE"] = "local"
+    os.chdir(path)
+    yield path
+    os.chdir(previous_cwd)
+    if previous_mode is None:
+        os.environ.pop("STORAGE_MODE", None)
+    else:
+        os.environ["STORAGE_MODE"] = previous_mode
+
+
+def import_server_module(name: str, *dependencies: str):
+    """Import a server module, skipping the calling tests if a dependency is missing."""
+    for dependency in dependencies:
+        pytest.importorskip(dependency)
+    return importlib.import_module(name)
+
+
+@pytest.fixture(scope="session")
+def cache_util(workdir):
+    return import_server_module("cache_util", "numpy")
+
+
+@pytest.fixture(scope="session")
+def file_util(workdir):
+    return import_server_module("file_util_enhanced", "langchain_community")
+
+
+@pytest.fixture(scope="session")
+def ingest_docs(workdir):
+    return import_server_module("ingest_docs", "dotenv", "langchain_openai", "langchain_community",
+                                "pinecone", "pinecone_text")
+
+
+@pytest.fixture(scope="session")
+def hybrid_search(workdir):
+    return import_server_module("hybrid_search", "dotenv", "httpx", "langchain", "langchain_openai",
+                                "langchain_community", "langchain_experimental", "pandas",
+                                "pinecone", "pinecone_text")
+
+
+@pytest.fixture(scope="session")
+def bm25_ready(hybrid_search):
+    """Skip the calling tests if BM25Encoder cannot load its NLTK data."""
+    try:
+        hybrid_search.BM25Encoder()
+    except LookupError:
+        pytest.skip("NLTK data for BM25Encoder is not installed")
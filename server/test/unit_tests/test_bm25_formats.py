@@ -0,0 +1,85 @@
+"""
+Unit tests for BM25 encoder merging and the on-disk index formats in hybrid_search.
+"""
+
+import gzip
+import json
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("bm25_ready")
+
+
+def make_encoder(hybrid_search, doc_freq, n_docs, avgdl, k1=1.2, b=0.75):
+    encoder = hybrid_search.BM25Encoder()
+    encoder.doc_freq = dict(doc_freq)
+    encoder.n_docs = n_docs
+    encoder.avgdl = avgdl
+    encoder.k1 = k1
+    encoder.b = b
+    return encoder
+
+
+def encoder_params(encoder):
+    return encoder.doc_freq, encoder.n_docs, encoder.avgdl, encoder.k1, encoder.b
+
+
+class TestIndexSignature:
+
+    def test_tracks_names_and_mtimes(self, hybrid_search):
+        signature = hybrid_search.get_bm25_index_signature({"a.json.gz": 1.0, "b.json": 2.0})
+        assert signature == hybrid_search.get_bm25_index_signature({"b.json": 2.0, "a.json.gz": 1.0})
+        assert signature != hybrid_search.get_bm25_index_signature({"a.json.gz": 1.5, "b.json": 2.0})
+        assert signature != hybrid_search.get_bm25_index_signature({"a.json.gz": 1.0})
+
+
+class TestMergeBM25Encoders:
+
+    def test_sums_document_frequencies(self, hybrid_search):
+        first = make_encoder(hybrid_search, {1: 2.0, 2: 1.0}, n_docs=2, avgdl=10.0)
+        second = make_encoder(hybrid_search, {2: 3.0, 3: 1.0}, n_docs=6, avgdl=20.0)
+        merged = hybrid_search.merge_bm25_encoders([first, second])
+        assert merged.doc_freq == {1: 2.0, 2: 4.0, 3: 1.0}
+        assert merged.n_docs == 8
+
+    def test_average_length_is_weighted_by_corpus_size(self, hybrid_search):
+        first = make_encoder(hybrid_search, {1: 1.0}, n_docs=2, avgdl=10.0)
+        second = make_encoder(hybrid_search, {1: 1.0}, n_docs=6, avgdl=20.0)
+        merged = hybrid_search.merge_bm25_encoders([first, second])
+        assert merged.avgdl == pytest.approx(17.5)
+
+    def test_keeps_parameters_of_the_first_encoder(self, hybrid_search):
+        first = make_encoder(hybrid_search, {1: 1.0}, n_docs=1, avgdl=5.0, k1=1.5, b=0.5)
+        second = make_encoder(hybrid_search, {2: 1.0}, n_docs=1, avgdl=5.0)
+        merged = hybrid_search.merge_bm25_encoders([first, second])
+        assert (merged.k1, merged.b) == (1.5, 0.5)
+
+
+class TestMergedEncoderArchive:
+
+    def test_round_trip(self, hybrid_search):
+        encoder = make_encoder(hybrid_search, {12345678901: 3.0, -7: 1.0}, n_docs=4, avgdl=12.5)
+        content = hybrid_search.serialize_bm25_encoder(encoder)
+        restored = hybrid_search.deserialize_bm25_encoder(content)
+        assert encoder_params(restored) == encoder_params(encoder)
+
+    def test_rejects_non_archive_content(self, hybrid_search):
+        with pytest.raises(Exception):
+            hybrid_search.deserialize_bm25_encoder(b"not an archive")
+
+
+class TestIndexFiles:
+
+    @pytest.fixture
+    def encoder_json(self):
+        return json.dumps({"doc_freq": {"42": 2, "7": 1}, "n_docs": 1, "avgdl": 9.0, "k1": 1.2, "b": 0.75})
+
+    def test_loads_plain_json_indexes(self, hybrid_search, encoder_json):
+        encoder = hybrid_search.load_bm25_encoder_from_file(encoder_json, "report.json")
+        assert encoder.doc_freq == {42: 2, 7: 1}
+        assert (encoder.n_docs, encoder.avgdl) == (1, 9.0)
+
+    def test_loads_gzip_indexes(self, hybrid_search, encoder_json):
+        content = gzip.compress(encoder_json.encode("utf-8"))
+        encoder = hybrid_search.load_bm25_encoder_from_file(content, "report.json.gz")
+        assert encoder.doc_freq == {42: 2, 7: 1}
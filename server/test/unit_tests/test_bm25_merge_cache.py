@@ -0,0 +1,57 @@
+"""
+Unit tests for caching the merged BM25 encoder on storage in hybrid_search.
+"""
+
+import gzip
+import json
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("bm25_ready")
+
+
+def index_content(doc_freq, n_docs):
+    return gzip.compress(json.dumps(
+        {"doc_freq": doc_freq, "n_docs": n_docs, "avgdl": 10.0, "k1": 1.2, "b": 0.75}).encode("utf-8"))
+
+
+@pytest.fixture
+def bm25_dir(hybrid_search):
+    """Start each test with an empty BM25 index directory."""
+    file_manager = hybrid_search.file_manager
+    for file_name in file_manager.list_files(hybrid_search.BM25_INDEXES_PATH):
+        file_manager.delete_file(hybrid_search.BM25_INDEXES_PATH, file_name)
+    file_manager.save_binary_file(hybrid_search.BM25_INDEXES_PATH, "a.json.gz", index_content({"1": 1}, 1))
+    file_manager.save_binary_file(hybrid_search.BM25_INDEXES_PATH, "b.json.gz", index_content({"1": 1, "2": 1}, 2))
+    return file_manager
+
+
+def merged_files(hybrid_search, file_manager):
+    return file_manager.list_files(hybrid_search.BM25_INDEXES_PATH, suffix=hybrid_search.MERGED_BM25_SUFFIX)
+
+
+class TestMergedEncoderCache:
+
+    def test_merged_encoder_is_cached_and_reused(self, hybrid_search, bm25_dir, monkeypatch):
+        encoder = hybrid_search.create_bm25_encoder()
+        assert encoder.doc_freq == {1: 2, 2: 1}
+        assert len(merged_files(hybrid_search, bm25_dir)) == 1
+
+        def fail_download(json_files):
+            raise AssertionError("indexes were downloaded despite a cached merge")
+        monkeypatch.setattr(hybrid_search, "_download_bm25_indexes", fail_download)
+        assert hybrid_search.create_bm25_encoder().doc_freq == {1: 2, 2: 1}
+
+    def test_partial_merge_is_not_cached(self, hybrid_search, bm25_dir):
+        bm25_dir.save_binary_file(hybrid_search.BM25_INDEXES_PATH, "c.json.gz", b"not gzip")
+        encoder = hybrid_search.create_bm25_encoder()
+        assert encoder.n_docs == 3
+        assert merged_files(hybrid_search, bm25_dir) == []
+
+    def test_changed_index_set_replaces_the_cached_merge(self, hybrid_search, bm25_dir):
+        hybrid_search.create_bm25_encoder()
+        first_cache = merged_files(hybrid_search, bm25_dir)
+        bm25_dir.save_binary_file(hybrid_search.BM25_INDEXES_PATH, "c.json.gz", index_content({"3": 1}, 1))
+        assert hybrid_search.create_bm25_encoder().doc_freq == {1: 2, 2: 1, 3: 1}
+        second_cache = merged_files(hybrid_search, bm25_dir)
+        assert len(second_cache) == 1 and second_cache != first_cache
@@ -0,0 +1,144 @@
+"""
+Unit tests for the in-process caches in cache_util.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch, cache_util):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(cache_util.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def unit_vector(*components):
+    vector = np.asarray(components, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class TestTTLCache:
+
+    def test_get_returns_stored_value(self, cache_util, clock):
+        cache = cache_util.TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+
+    def test_entries_expire_after_ttl(self, cache_util, clock):
+        cache = cache_util.TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        clock.now += 10.5
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self, cache_util, clock):
+        cache = cache_util.TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_clear(self, cache_util, clock):
+        cache = cache_util.TTLCache()
+        cache.set("a", 1)
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestQueryEmbeddingCache:
+
+    def test_miss_returns_none(self, cache_util):
+        assert cache_util.QueryEmbeddingCache().get("query") is None
+
+    def test_stores_embeddings_as_int8(self, cache_util):
+        cache = cache_util.QueryEmbeddingCache(maxsize=4)
+        embedding = [0.1, -0.2, 0.3]
+        cache.set("query", embedding)
+        quantized, _ = cache._cache.get("query")
+        assert quantized.dtype == np.int8
+        np.testing.assert_allclose(cache.get("query"), embedding, atol=0.3 / 127)
+
+    def test_evicts_beyond_maxsize(self, cache_util):
+        cache = cache_util.QueryEmbeddingCache(maxsize=1)
+        cache.set("first", [1.0])
+        cache.set("second", [2.0])
+        assert cache.get("first") is None
+        assert len(cache) == 1
+
+
+class TestSemanticResponseCache:
+
+    def test_empty_cache_misses(self, cache_util):
+        cache = cache_util.SemanticResponseCache()
+        assert cache.lookup(unit_vector(1, 0)) is None
+
+    def test_similar_query_hits(self, cache_util, clock):
+        cache = cache_util.SemanticResponseCache(maxsize=4, threshold=0.97)
+        cache.add(unit_vector(1, 0, 0), "answer")
+        assert cache.lookup(unit_vector(1, 0.05, 0)) == "answer"
+
+    def test_dissimilar_query_misses(self, cache_util, clock):
+        cache = cache_util.SemanticResponseCache(maxsize=4, threshold=0.97)
+        cache.add(unit_vector(1, 0, 0), "answer")
+        assert cache.lookup(unit_vector(1, 1, 0)) is None
+
+    def test_namespaces_are_isolated(self, cache_util, clock):
+        cache = cache_util.SemanticResponseCache(maxsize=4)
+        cache.add(unit_vector(1, 0), "from a", namespace="a.pdf")
+        assert cache.lookup(unit_vector(1, 0), namespace="b.pdf") is None
+        assert cache.lookup(unit_vector(1, 0), namespace="a.pdf") == "from a"
+
+    def test_entries_expire_after_ttl(self, cache_util, clock):
+        cache = cache_util.SemanticResponseCache(maxsize=4, ttl=60)
+        cache.add(unit_vector(1, 0), "answer")
+        clock.now += 61
+        assert cache.lookup(unit_vector(1, 0)) is None
+
+    def test_least_recently_used_entry_is_evicted(self, cache_util, clock):
+        cache = cache_util.SemanticResponseCache(maxsize=2)
+        cache.add(unit_vector(1, 0, 0), "x")
+        clock.now += 1
+        cache.add(unit_vector(0, 1, 0), "y")
+        clock.now += 1
+        assert cache.lookup(unit_vector(1, 0, 0)) == "x"
+        clock.now += 1
+        cache.add(unit_vector(0, 0, 1), "z")
+        assert cache.lookup(unit_vector(1, 0, 0)) == "x"
+        assert cache.lookup(unit_vector(0, 1, 0)) is None
+        assert cache.lookup(unit_vector(0, 0, 1)) == "z"
+
+    def test_clear(self, cache_util, clock):
+        cache = cache_util.SemanticResponseCache(maxsize=4)
+        cache.add(unit_vector(1, 0), "answer")
+        cache.clear()
+        assert cache.lookup(unit_vector(1, 0)) is None
+
+
+class TestQuantizeInt8:
+
+    def test_round_trip_is_close(self, cache_util):
+        vector = [0.5, -1.0, 0.25, 0.0]
+        quantized, scale = cache_util.quantize_int8(vector)
+        assert quantized.dtype == np.int8
+        np.testing.assert_allclose(quantized * scale, vector, atol=1.0 / 127)
+
+    def test_zero_vector_has_unit_scale(self, cache_util):
+        quantized, scale = cache_util.quantize_int8([0.0, 0.0])
+        assert scale == 1.0
+        assert not quantized.any()
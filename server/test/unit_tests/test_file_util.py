@@ -0,0 +1,63 @@
+"""
+Unit tests for the filename helpers and stem index in file_util_enhanced.
+"""
+
+import pytest
+
+
+class TestFileStem:
+
+    @pytest.mark.parametrize("filename, stem", [
+        ("report.pdf", "report"),
+        ("Data.XLSX", "Data"),
+        ("report.v2.pdf", "report.v2"),
+        ("report.v2", "report.v2"),
+        ("report", "report"),
+    ])
+    def test_strips_only_known_extensions(self, file_util, filename, stem):
+        assert file_util.file_stem(filename) == stem
+
+
+class TestMapFilesByStem:
+
+    def test_maps_stems_to_filenames(self, file_util):
+        files = ["a.pdf", "b.v2.csv", "notes.txt"]
+        assert file_util.map_files_by_stem(files) == {"a": "a.pdf", "b.v2": "b.v2.csv", "notes": "notes.txt"}
+
+    def test_first_listed_file_wins(self, file_util):
+        assert file_util.map_files_by_stem(["a.pdf", "a.docx"]) == {"a": "a.pdf"}
+
+    def test_whole_stems_only(self, file_util):
+        assert "Sample1" not in file_util.map_files_by_stem(["Sample1.v2.pdf"])
+
+
+class TestResolveByStem:
+
+    @pytest.fixture
+    def file_manager(self, file_util):
+        manager = file_util.FileManager(storage_mode="local")
+        yield manager
+        for filename in manager.list_files(file_util.UPLOADED_FILES_DIR):
+            manager.delete_file(file_util.UPLOADED_FILES_DIR, filename)
+
+    def test_finds_saved_upload(self, file_util, file_manager):
+        assert file_manager.resolve_by_stem("report") is None
+        file_manager.save_binary_file(file_util.UPLOADED_FILES_DIR, "report.pdf", b"%PDF")
+        assert file_manager.resolve_by_stem("report") == "report.pdf"
+
+    def test_forgets_deleted_upload(self, file_util, file_manager):
+        file_manager.save_binary_file(file_util.UPLOADED_FILES_DIR, "report.pdf", b"%PDF")
+        assert file_manager.resolve_by_stem("report") == "report.pdf"
+        file_manager.delete_file(file_util.UPLOADED_FILES_DIR, "report.pdf")
+        assert file_manager.resolve_by_stem("report") is None
+
+    def test_miss_relists_files_written_elsewhere(self, file_util, file_manager, workdir):
+        assert file_manager.resolve_by_stem("other") is None
+        (workdir / file_util.UPLOADED_FILES_DIR / "other.docx").write_bytes(b"docx")
+        assert file_manager.resolve_by_stem("other") == "other.docx"
+
+    def test_other_directories_keep_the_index(self, file_util, file_manager):
+        file_manager.save_binary_file(file_util.UPLOADED_FILES_DIR, "report.pdf", b"%PDF")
+        file_manager.resolve_by_stem("report")
+        file_manager.save_file(file_util.PARSED_FILES_DIR, "report.md", "# Report")
+        assert file_manager._uploaded_by_stem == {"report": "report.pdf"}
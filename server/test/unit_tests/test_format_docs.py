@@ -0,0 +1,44 @@
+"""
+Unit tests for rendering retrieved documents into the LLM context in hybrid_search.
+"""
+
+
+def make_doc(hybrid_search, text, source, chunk_id, score=None):
+    metadata = {"source": source, "chunk_id": chunk_id}
+    if score is not None:
+        metadata["score"] = score
+    return hybrid_search.Document(page_content=text, metadata=metadata)
+
+
+def rendered_order(hybrid_search, docs):
+    context = hybrid_search.format_docs(docs)
+    return sorted((context.index(doc.page_content), doc.page_content) for doc in docs)
+
+
+class TestFormatDocs:
+
+    def test_most_relevant_document_comes_first(self, hybrid_search):
+        docs = [
+            make_doc(hybrid_search, "best", "z.pdf", 9, score=0.9),
+            make_doc(hybrid_search, "middle", "a.pdf", 0, score=0.5),
+            make_doc(hybrid_search, "worst", "a.pdf", 1, score=0.1),
+        ]
+        assert [text for _, text in rendered_order(hybrid_search, docs)] == ["best", "middle", "worst"]
+
+    def test_ties_render_the_same_in_any_retrieval_order(self, hybrid_search):
+        first = make_doc(hybrid_search, "first", "a.pdf", 0, score=0.5)
+        second = make_doc(hybrid_search, "second", "a.pdf", 1, score=0.5)
+        top = make_doc(hybrid_search, "top", "b.pdf", 0, score=0.9)
+        context = hybrid_search.format_docs([top, first, second])
+        assert hybrid_search.format_docs([top, second, first]) == context
+        assert context.index("top") < context.index("first") < context.index("second")
+
+    def test_documents_without_scores_keep_the_retriever_order(self, hybrid_search):
+        docs = [
+            make_doc(hybrid_search, "later chunk", "a.pdf", 5),
+            make_doc(hybrid_search, "earlier chunk", "a.pdf", 0),
+        ]
+        assert [text for _, text in rendered_order(hybrid_search, docs)] == ["later chunk", "earlier chunk"]
+
+    def test_no_documents(self, hybrid_search):
+        assert hybrid_search.format_docs([]) == "No relevant documents found."
@@ -0,0 +1,44 @@
+"""
+Unit tests for the per-event-loop async OpenAI clients in hybrid_search.
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def api_key(hybrid_search, monkeypatch):
+    monkeypatch.setattr(hybrid_search, "openai_api_key", "test-key")
+
+
+class TestAsyncClients:
+
+    def test_each_loop_gets_its_own_client(self, hybrid_search, api_key):
+        async def client_of_loop():
+            first = hybrid_search.get_async_embeddings()
+            assert hybrid_search.get_async_embeddings() is first
+            return first
+        assert hybrid_search.run_search(client_of_loop()) is not hybrid_search.run_search(client_of_loop())
+
+    def test_run_search_closes_the_loop_client(self, hybrid_search, api_key):
+        async def open_client():
+            hybrid_search.get_async_embeddings()
+            return hybrid_search._async_embeddings[asyncio.get_running_loop()][1]
+        http_async_client = hybrid_search.run_search(open_client())
+        assert http_async_client.is_closed
+        assert len(hybrid_search._async_embeddings) == 0
+
+    def test_run_search_closes_the_client_when_the_search_fails(self, hybrid_search, api_key):
+        clients = []
+
+        async def fail():
+            hybrid_search.get_async_embeddings()
+            clients.append(hybrid_search._async_embeddings[asyncio.get_running_loop()][1])
+            raise RuntimeError("search failed")
+        with pytest.raises(RuntimeError):
+            hybrid_search.run_search(fail())
+        assert clients[0].is_closed
+
+    def test_closing_without_a_client_is_a_no_op(self, hybrid_search):
+        hybrid_search.run_search(asyncio.sleep(0))
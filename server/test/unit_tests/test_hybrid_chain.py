@@ -0,0 +1,286 @@
+"""
+Unit tests for the async hybrid search entry points in hybrid_search.
+
+Retrieval, the query embedding, the LLM and the pandas agent are replaced with
+in-process fakes, so the routing between semantic search and the pandas fallback
+runs without network access.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+ANSWER = "Alice works in the finance team and joined in 2019."
+NO_ANSWER = "That information is not available in the context provided."
+
+
+def make_doc(hybrid_search, text, source="report.pdf", chunk_id=0, score=None):
+    metadata = {"source": source, "chunk_id": chunk_id}
+    if score is not None:
+        metadata["score"] = score
+    return hybrid_search.Document(page_content=text, metadata=metadata)
+
+
+class FakeSearch:
+    """Fakes for everything aexecute_hybrid_chain and astream_hybrid_chain call out to."""
+
+    def __init__(self, hybrid_search, monkeypatch):
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        from langchain_core.runnables import RunnableLambda
+
+        self.docs = [make_doc(hybrid_search, "Alice joined finance in 2019.")]
+        self.answers = [ANSWER]
+        self.semantic_error = None
+        self.pandas_result = "From people.csv:\nAlice, finance"
+        self.pandas_calls = []
+        self.cancel_events = []
+        self.speculative_wait = 0
+        self.pandas_started = threading.Event()
+        self.retrieval_waits_for_pandas = False
+        self.embedded = []
+        self.prompts = []
+
+        def llm():
+            chat_model = FakeListChatModel(responses=list(self.answers))
+            return RunnableLambda(self._record_prompt) | chat_model
+
+        async def aget_query_embedding(query):
+            self.embedded.append(query)
+            return [1.0, 0.0]
+
+        def retrieve_by_vector(query, query_embedding):
+            if self.retrieval_waits_for_pandas:
+                self.pandas_started.wait(5)
+            if self.semantic_error is not None:
+                raise self.semantic_error
+            return list(self.docs)
+
+        async def aget_filtered_documents(query, source_document, query_embedding=None):
+            return [doc for doc in self.docs if doc.metadata["source"] == source_document]
+
+        def execute_pandas_agent_search(query, source_document=None, cancel_event=None):
+            self.pandas_calls.append(source_document)
+            if cancel_event is not None:
+                self.cancel_events.append(cancel_event)
+                self.pandas_started.set()
+                # A speculative search runs until it is cancelled or the test's timeout passes
+                cancel_event.wait(self.speculative_wait)
+            return self.pandas_result
+
+        monkeypatch.setattr(hybrid_search, "SEMANTIC_CACHE_ENABLED", False)
+        monkeypatch.setattr(hybrid_search, "SPECULATIVE_PANDAS_SEARCH", False)
+        monkeypatch.setattr(hybrid_search, "get_llm", llm)
+        monkeypatch.setattr(hybrid_search, "aget_query_embedding", aget_query_embedding)
+        monkeypatch.setattr(hybrid_search, "retrieve_by_vector", retrieve_by_vector)
+        monkeypatch.setattr(hybrid_search, "get_retriever", lambda: RunnableLambda(
+            lambda query: retrieve_by_vector(query, None)))
+        monkeypatch.setattr(hybrid_search, "aget_filtered_documents", aget_filtered_documents)
+        monkeypatch.setattr(hybrid_search, "execute_pandas_agent_search", execute_pandas_agent_search)
+
+    def _record_prompt(self, prompt_value):
+        self.prompts.append(prompt_value if isinstance(prompt_value, str) else prompt_value.to_string())
+        return prompt_value
+
+
+@pytest.fixture
+def search(hybrid_search, monkeypatch):
+    return FakeSearch(hybrid_search, monkeypatch)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def collect(stream):
+    return "".join([token async for token in stream])
+
+
+class TestExecuteHybridChain:
+
+    def test_targeted_document_uses_semantic_search(self, hybrid_search, search):
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf")) == ANSWER
+        assert "Alice joined finance in 2019." in search.prompts[0]
+        assert search.pandas_calls == []
+
+    def test_targeted_document_without_chunks(self, hybrid_search, search):
+        result = run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "missing.pdf"))
+        assert result == "No documents found for source 'missing.pdf'."
+        assert search.prompts == []
+
+    def test_targeted_spreadsheet_uses_the_pandas_agent(self, hybrid_search, search):
+        result = run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "people.csv"))
+        assert result == search.pandas_result
+        assert search.pandas_calls == ["people.csv"]
+
+    def test_all_sources_returns_a_meaningful_semantic_answer(self, hybrid_search, search):
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "all")) == ANSWER
+        assert search.pandas_calls == []
+
+    def test_all_sources_falls_back_to_pandas_on_a_non_answer(self, hybrid_search, search):
+        search.answers = [NO_ANSWER]
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == search.pandas_result
+        assert search.pandas_calls == [None]
+
+    def test_all_sources_falls_back_to_pandas_when_retrieval_fails(self, hybrid_search, search):
+        search.semantic_error = RuntimeError("pinecone unavailable")
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == search.pandas_result
+
+    def test_no_answer_from_either_search(self, hybrid_search, search):
+        search.answers = [NO_ANSWER]
+        search.pandas_result = "No Excel or CSV files found for analysis."
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == hybrid_search.NO_ANSWER_MESSAGE
+
+    def test_debug_reports_the_path_taken(self, hybrid_search, search):
+        search.answers = [NO_ANSWER]
+        result, debug = run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", return_debug=True))
+        assert result == search.pandas_result
+        assert debug["search_strategy"] == "sequential_all_sources"
+        assert debug["semantic_search"]["documents_found"] == 1
+        assert debug["semantic_search"]["meaningful"] is False
+        assert debug["final_result_source"] == "pandas_agent_fallback"
+
+    def test_sync_entry_point(self, hybrid_search, search):
+        assert hybrid_search.execure_hybrid_chain("Who is Alice?", "report.pdf") == ANSWER
+
+
+class TestStreamHybridChain:
+
+    def test_targeted_document_streams_the_answer(self, hybrid_search, search):
+        assert run(collect(hybrid_search.astream_hybrid_chain("Who is Alice?", "report.pdf"))) == ANSWER
+
+    def test_targeted_spreadsheet_yields_the_pandas_answer(self, hybrid_search, search):
+        streamed = run(collect(hybrid_search.astream_hybrid_chain("Who is Alice?", "people.csv")))
+        assert streamed == search.pandas_result
+
+    def test_all_sources_streams_a_meaningful_answer(self, hybrid_search, search):
+        assert run(collect(hybrid_search.astream_hybrid_chain("Who is Alice?"))) == ANSWER
+        assert search.pandas_calls == []
+
+    def test_all_sources_appends_the_pandas_answer_to_a_non_answer(self, hybrid_search, search):
+        search.answers = [NO_ANSWER]
+        streamed = run(collect(hybrid_search.astream_hybrid_chain("Who is Alice?")))
+        assert streamed == NO_ANSWER + "\n\n" + search.pandas_result
+
+    def test_all_sources_without_any_answer(self, hybrid_search, search):
+        search.semantic_error = RuntimeError("pinecone unavailable")
+        search.pandas_result = "No Excel or CSV files found for analysis."
+        streamed = run(collect(hybrid_search.astream_hybrid_chain("Who is Alice?")))
+        assert streamed == hybrid_search.NO_ANSWER_MESSAGE
+
+
+class TestSemanticResponseCache:
+
+    @pytest.fixture
+    def response_cache(self, hybrid_search, search, monkeypatch):
+        cache = hybrid_search.SemanticResponseCache(maxsize=8)
+        monkeypatch.setattr(hybrid_search, "SEMANTIC_CACHE_ENABLED", True)
+        monkeypatch.setattr(hybrid_search, "_semantic_response_cache", cache)
+        return cache
+
+    def test_repeated_question_is_answered_from_the_cache(self, hybrid_search, search, response_cache):
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf")) == ANSWER
+        search.answers = ["A different answer that should never be generated."]
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf")) == ANSWER
+        assert len(search.prompts) == 1
+
+    def test_cache_is_scoped_to_the_source(self, hybrid_search, search, response_cache):
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf"))
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "all"))
+        assert len(search.prompts) == 2
+
+    def test_non_answers_are_not_cached(self, hybrid_search, search, response_cache):
+        search.answers = [NO_ANSWER]
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf"))
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf"))
+        assert len(search.prompts) == 2
+
+    def test_missing_source_message_is_not_cached(self, hybrid_search, search, response_cache):
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "missing.pdf"))
+        assert response_cache.lookup([1.0, 0.0], "missing.pdf") is None
+
+    def test_pandas_answers_are_not_cached(self, hybrid_search, search, response_cache):
+        search.answers = [NO_ANSWER]
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == search.pandas_result
+        assert response_cache.lookup([1.0, 0.0], "all") is None
+
+    def test_invalidation_drops_cached_answers(self, hybrid_search, search, response_cache):
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf"))
+        hybrid_search.invalidate_search_caches()
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf"))
+        assert len(search.prompts) == 2
+
+    def test_debug_requests_bypass_the_cache(self, hybrid_search, search, response_cache):
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf"))
+        run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", "report.pdf", return_debug=True))
+        assert len(search.prompts) == 2
+
+
+class SearchAborted(BaseException):
+    """Escapes the semantic step's error handling, like a cancelled request."""
+
+
+class TestSpeculativePandasSearch:
+
+    @pytest.fixture
+    def slots(self, hybrid_search, search, monkeypatch):
+        slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr(hybrid_search, "SPECULATIVE_PANDAS_SEARCH", True)
+        monkeypatch.setattr(hybrid_search, "_speculative_pandas_slots", slots)
+        return slots
+
+    def test_unused_speculation_is_cancelled(self, hybrid_search, search, slots):
+        search.speculative_wait = 5
+        search.retrieval_waits_for_pandas = True
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == ANSWER
+        assert [event.is_set() for event in search.cancel_events] == [True]
+        # The cancelled search returns promptly and frees its slot on the worker
+        assert slots.acquire(timeout=1)
+
+    def test_speculation_is_cancelled_when_the_search_fails(self, hybrid_search, search, slots, monkeypatch):
+        search.speculative_wait = 5
+
+        def fail(*args, **kwargs):
+            raise SearchAborted()
+        monkeypatch.setattr(hybrid_search, "_agenerate_with_early_check", fail)
+        with pytest.raises(SearchAborted):
+            run(hybrid_search.aexecute_hybrid_chain("Who is Alice?"))
+        assert all(event.is_set() for event in search.cancel_events)
+        assert slots.acquire(timeout=1)
+
+    def test_running_speculation_is_cancelled_when_the_search_fails(self, hybrid_search, search, slots, monkeypatch):
+        search.speculative_wait = 5
+        search.retrieval_waits_for_pandas = True
+
+        def fail(*args, **kwargs):
+            raise SearchAborted()
+        monkeypatch.setattr(hybrid_search, "_agenerate_with_early_check", fail)
+        with pytest.raises(SearchAborted):
+            run(hybrid_search.aexecute_hybrid_chain("Who is Alice?"))
+        assert [event.is_set() for event in search.cancel_events] == [True]
+        assert slots.acquire(timeout=1)
+
+    def test_speculation_that_never_started_frees_its_slot(self, hybrid_search, search, slots, monkeypatch):
+        busy = threading.Event()
+        monkeypatch.setattr(hybrid_search, "_speculative_pandas_executor",
+                            hybrid_search.ThreadPoolExecutor(max_workers=1))
+        hybrid_search._speculative_pandas_executor.submit(busy.wait, 5)
+        try:
+            assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == ANSWER
+        finally:
+            busy.set()
+            hybrid_search._speculative_pandas_executor.shutdown(wait=True)
+        assert search.pandas_calls == []
+        assert slots.acquire(blocking=False)
+
+    def test_speculative_result_is_used_as_the_fallback(self, hybrid_search, search, slots):
+        search.answers = [NO_ANSWER]
+        result, debug = run(hybrid_search.aexecute_hybrid_chain("Who is Alice?", return_debug=True))
+        assert result == search.pandas_result
+        assert debug["pandas_search"]["speculative"] is True
+        assert search.pandas_calls == [None]
+
+    def test_no_speculation_without_a_free_slot(self, hybrid_search, search, slots):
+        slots.acquire()
+        assert run(hybrid_search.aexecute_hybrid_chain("Who is Alice?")) == ANSWER
+        assert search.pandas_calls == []
@@ -0,0 +1,115 @@
+"""
+Unit tests for the pure chunking, metadata and hashing helpers in ingest_docs.
+"""
+
+import json
+
+import pytest
+
+
+class TestMetadataSize:
+
+    @pytest.mark.parametrize("metadata", [
+        {},
+        {"source": "report.pdf", "chunk_id": 3, "score": 0.5, "flag": True, "missing": None},
+        {"source": 'quotes " and \\ backslashes\n'},
+        {"source": "Überblick – 日本語 😀"},
+    ])
+    def test_estimate_is_never_below_the_serialized_size(self, ingest_docs, metadata):
+        exact = len(json.dumps(metadata).encode("utf-8"))
+        assert ingest_docs.estimate_metadata_size(metadata) >= exact
+        assert ingest_docs.calculate_metadata_size(metadata) <= exact
+
+    def test_nested_values_cannot_be_estimated(self, ingest_docs):
+        assert ingest_docs.estimate_metadata_size({"tags": ["a", "b"]}) is None
+
+    def test_metadata_may_exceed(self, ingest_docs):
+        assert not ingest_docs.metadata_may_exceed({"source": "a.pdf"}, 40000)
+        assert ingest_docs.metadata_may_exceed({"content": "x" * 50000}, 40000)
+
+
+class TestFindOversizedRecords:
+
+    def test_counts_the_chunk_text(self, ingest_docs):
+        metadatas = [{"source": "a.pdf"}, {"source": "a.pdf"}]
+        texts = ["short", "x" * 40000]
+        assert ingest_docs.find_oversized_records(metadatas, texts) == [1]
+
+
+class TestEstimateChunkCounts:
+
+    def test_uses_stored_totals_and_defaults(self, ingest_docs):
+        first_chunks = {"a": {"total_chunks": 7}, "b": {}}
+        assert ingest_docs.estimate_chunk_counts(["a", "b", "c"], first_chunks, 12) == {"a": 7, "b": 12, "c": 0}
+
+    def test_unknown_probe_uses_the_default(self, ingest_docs):
+        assert ingest_docs.estimate_chunk_counts(["a", "b"], None, 12) == {"a": 12, "b": 12}
+
+
+class TestTruncateMetadata:
+
+    def test_shortens_large_fields(self, ingest_docs):
+        truncated = ingest_docs.truncate_metadata({"source": "a.pdf", "summary": "s" * 5000})
+        assert truncated["source"] == "a.pdf"
+        assert truncated["summary"].endswith("... [truncated]")
+        assert len(truncated["summary"]) < 1000
+
+    def test_falls_back_to_essential_fields(self, ingest_docs):
+        metadata = {"source": "a.pdf", "chunk_id": 0, "total_chunks": 2, "content_hash": "h",
+                    "notes": "n" * 50000}
+        assert ingest_docs.truncate_metadata(metadata) == {
+            "source": "a.pdf", "chunk_id": 0, "total_chunks": 2, "content_hash": "h"
+        }
+
+
+class TestSplitMarkdownSections:
+
+    def test_sections_cover_the_whole_text(self, ingest_docs):
+        text = "intro\n# A\ntext a\n## B\nb text\n### C\nc\n# D\nd\n"
+        sections = ingest_docs.split_markdown_sections(text)
+        assert "".join(section for _, section in sections) == text
+
+    def test_sections_carry_their_parent_headers(self, ingest_docs):
+        text = "intro\n# A\ntext a\n## B\nb text\n### C\nc\n# D\nd\n"
+        assert ingest_docs.split_markdown_sections(text) == [
+            ((), "intro\n"),
+            ((), "# A\ntext a\n"),
+            (("# A",), "## B\nb text\n"),
+            (("# A", "## B"), "### C\nc\n"),
+            ((), "# D\nd\n"),
+        ]
+
+    def test_headers_inside_code_fences_are_ignored(self, ingest_docs):
+        text = "# A\n```python\n# a comment\n```\nafter\n"
+        assert ingest_docs.split_markdown_sections(text) == [((), text)]
+
+    def test_deeper_headers_do_not_split(self, ingest_docs):
+        text = "# A\n#### Detail\nbody\n"
+        assert ingest_docs.split_markdown_sections(text) == [((), text)]
+
+    def test_plain_text_is_one_section(self, ingest_docs):
+        assert ingest_docs.split_markdown_sections("just text\n") == [((), "just text\n")]
+
+
+class TestBM25ContentHash:
+
+    def test_tracks_the_text(self, ingest_docs):
+        first = ingest_docs.compute_bm25_content_hash("some text")
+        assert first == ingest_docs.compute_bm25_content_hash("some text")
+        assert first != ingest_docs.compute_bm25_content_hash("other text")
+        assert len(first) == 32
+
+
+class TestIsExcelCsvFile:
+
+    @pytest.mark.parametrize("file_name, expected", [
+        ("data.CSV", True),
+        ("book.xlsx", True),
+        ("archive.v1.xls", True),
+        ("report.pdf", False),
+        ("csv", False),
+        ("", False),
+        (None, False),
+    ])
+    def test_matches_spreadsheet_extensions(self, ingest_docs, file_name, expected):
+        assert ingest_docs.is_excel_csv_file(file_name) is expected
@@ -0,0 +1,137 @@
+"""
+Unit tests for the Pinecone ingest path in ingest_docs, run against an in-memory index.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeIndex:
+    """In-memory stand-in for a Pinecone index that records every call."""
+
+    def __init__(self):
+        self.vectors = {}
+        self.upserted_ids = []
+        self.deleted_ids = []
+        self.delete_filters = []
+
+    def upsert(self, vectors, namespace=None):
+        for record in vectors:
+            self.vectors[record["id"]] = record
+            self.upserted_ids.append(record["id"])
+
+    def fetch(self, ids, namespace=None):
+        return SimpleNamespace(vectors={
+            vector_id: SimpleNamespace(metadata=self.vectors[vector_id]["metadata"])
+            for vector_id in ids if vector_id in self.vectors
+        })
+
+    def delete(self, ids=None, filter=None, namespace=None):
+        if ids is not None:
+            self.deleted_ids.extend(ids)
+            for vector_id in ids:
+                self.vectors.pop(vector_id, None)
+        if filter is not None:
+            self.delete_filters.append(filter)
+            sources = set(filter["source"]["$in"])
+            for vector_id in [vector_id for vector_id, record in self.vectors.items()
+                              if record["metadata"].get("source") in sources]:
+                del self.vectors[vector_id]
+
+
+class FakeEmbeddings:
+    """Embeds each text as its length; texts listed in fail_on make their batch raise."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+
+    def embed_documents(self, texts):
+        if self.fail_on & set(texts):
+            raise RuntimeError("embedding batch failed")
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture
+def pinecone(ingest_docs, monkeypatch):
+    """Route the ingest path to a fresh in-memory index, splitting documents on '|'."""
+    index = FakeIndex()
+    monkeypatch.setattr(ingest_docs, "create_index", lambda: index)
+    monkeypatch.setattr(ingest_docs, "get_write_index", lambda: index)
+    monkeypatch.setattr(ingest_docs, "get_vector_store", lambda: "vector_store")
+    monkeypatch.setattr(ingest_docs, "get_embeddings", lambda: FakeEmbeddings())
+    monkeypatch.setattr(ingest_docs, "split_document_text", lambda text: text.split("|"))
+    monkeypatch.setattr(ingest_docs, "EMBEDDING_BATCH_SIZE", 2)
+    monkeypatch.setattr(ingest_docs, "UPSERT_BATCH_SIZE", 1)
+    return index
+
+
+def ingest(ingest_docs, text):
+    return ingest_docs.ingest_documents_to_pinecone_hybrid(
+        "report.md", text_content=text, metadata={}, original_filename="report.pdf")
+
+
+def chunk_ids(count):
+    return [f"report_chunk_{i}" for i in range(count)]
+
+
+class TestEmbedAndUpsert:
+
+    def test_first_chunk_is_upserted_last(self, ingest_docs, pinecone):
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        ingest_docs.embed_and_upsert(pinecone, texts, [{} for _ in texts], chunk_ids(5))
+        assert sorted(pinecone.upserted_ids) == chunk_ids(5)
+        assert pinecone.upserted_ids[-1] == "report_chunk_0"
+        assert pinecone.vectors["report_chunk_2"]["values"] == [3.0]
+        assert pinecone.vectors["report_chunk_2"]["metadata"]["text"] == "ccc"
+
+    def test_failed_batch_leaves_the_first_chunk_unwritten(self, ingest_docs, pinecone, monkeypatch):
+        monkeypatch.setattr(ingest_docs, "get_embeddings", lambda: FakeEmbeddings(fail_on={"eeeee"}))
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        with pytest.raises(RuntimeError):
+            ingest_docs.embed_and_upsert(pinecone, texts, [{} for _ in texts], chunk_ids(5))
+        assert "report_chunk_0" not in pinecone.vectors
+
+
+class TestContentHashSkip:
+
+    def test_unchanged_content_is_not_re_embedded(self, ingest_docs, pinecone):
+        assert ingest(ingest_docs, "a|b|c") == "vector_store"
+        upserts = len(pinecone.upserted_ids)
+        assert ingest(ingest_docs, "a|b|c") == "vector_store"
+        assert len(pinecone.upserted_ids) == upserts
+
+    def test_retry_after_a_failed_batch_re_ingests(self, ingest_docs, pinecone, monkeypatch):
+        ingest(ingest_docs, "a|b|c")
+        monkeypatch.setattr(ingest_docs, "get_embeddings", lambda: FakeEmbeddings(fail_on={"z"}))
+        with pytest.raises(RuntimeError):
+            ingest(ingest_docs, "x|y|z|w")
+        # The first chunk still describes the previous version, so the retry is not skipped
+        assert pinecone.vectors["report_chunk_0"]["metadata"]["total_chunks"] == 3
+
+        monkeypatch.setattr(ingest_docs, "get_embeddings", lambda: FakeEmbeddings())
+        ingest(ingest_docs, "x|y|z|w")
+        assert sorted(pinecone.vectors) == chunk_ids(4)
+        assert [pinecone.vectors[vector_id]["metadata"]["text"] for vector_id in chunk_ids(4)] == ["x", "y", "z", "w"]
+        assert pinecone.vectors["report_chunk_0"]["metadata"]["total_chunks"] == 4
+
+    def test_surplus_chunks_of_a_longer_version_are_deleted(self, ingest_docs, pinecone):
+        ingest(ingest_docs, "a|b|c|d|e")
+        ingest(ingest_docs, "a|b|x")
+        assert sorted(pinecone.vectors) == chunk_ids(3)
+        assert pinecone.deleted_ids == ["report_chunk_3", "report_chunk_4"]
+
+
+class TestLegacyCleanup:
+
+    def test_vectors_stored_under_random_ids_are_deleted(self, ingest_docs, pinecone):
+        for vector_id in ("3f2b9c1e-uuid", "8a7d6e5f-uuid"):
+            pinecone.upsert([{"id": vector_id, "values": [0.0], "metadata": {"source": "report.pdf", "text": "old"}}])
+        ingest(ingest_docs, "a|b")
+        assert sorted(pinecone.vectors) == chunk_ids(2)
+
+    def test_first_ingest_only_runs_the_source_filter(self, ingest_docs, pinecone):
+        ingest(ingest_docs, "a|b")
+        assert len(pinecone.delete_filters) == 1
+        assert "report.pdf" in pinecone.delete_filters[0]["source"]["$in"]
+        assert pinecone.deleted_ids == []
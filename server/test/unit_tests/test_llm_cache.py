@@ -0,0 +1,33 @@
+"""
+Unit tests for the LLM response cache attached to the search model in hybrid_search.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def captured_llm_kwargs(hybrid_search, monkeypatch):
+    """Capture the arguments get_llm passes to init_chat_model."""
+    captured = {}
+
+    def fake_init_chat_model(model, **kwargs):
+        captured.update(kwargs)
+        return "llm"
+    monkeypatch.setattr(hybrid_search, "init_chat_model", fake_init_chat_model)
+    monkeypatch.setattr(hybrid_search, "_llm", None)
+    return captured
+
+
+class TestLLMCache:
+
+    def test_memory_cache_is_attached_to_the_search_model_only(self, hybrid_search, captured_llm_kwargs, monkeypatch):
+        from langchain_core.globals import get_llm_cache
+        monkeypatch.setattr(hybrid_search, "LLM_CACHE_TYPE", "memory")
+        assert hybrid_search.get_llm() == "llm"
+        assert isinstance(captured_llm_kwargs["cache"], hybrid_search.InMemoryCache)
+        assert get_llm_cache() is None
+
+    def test_disabled_cache_opts_out_of_caching(self, hybrid_search, captured_llm_kwargs, monkeypatch):
+        monkeypatch.setattr(hybrid_search, "LLM_CACHE_TYPE", "none")
+        hybrid_search.get_llm()
+        assert captured_llm_kwargs["cache"] is False
@@ -0,0 +1,87 @@
+"""
+Unit tests for the process-wide OpenAI request limiter in hybrid_search.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+LIMIT = 2
+
+
+@pytest.fixture
+def semaphore(hybrid_search, monkeypatch):
+    """Swap in a small limiter so saturation is easy to reach."""
+    limiter = threading.BoundedSemaphore(LIMIT)
+    monkeypatch.setattr(hybrid_search, "_openai_thread_semaphore", limiter)
+    monkeypatch.setattr(hybrid_search, "_openai_slot_executor", ThreadPoolExecutor(max_workers=LIMIT))
+    return limiter
+
+
+class ConcurrencyProbe:
+    """Tracks how many callers hold a slot at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def exit(self):
+        with self.lock:
+            self.active -= 1
+
+
+class TestOpenAIRequestSlot:
+
+    def test_limit_holds_across_threads_and_event_loops(self, hybrid_search, semaphore):
+        probe = ConcurrencyProbe()
+
+        async def async_caller():
+            async with hybrid_search.openai_request_slot():
+                probe.enter()
+                await asyncio.sleep(0.02)
+                probe.exit()
+
+        def sync_caller():
+            with hybrid_search._openai_thread_semaphore:
+                probe.enter()
+                time.sleep(0.02)
+                probe.exit()
+
+        callers = [lambda: asyncio.run(async_caller()) for _ in range(6)] + [sync_caller] * 4
+        with ThreadPoolExecutor(max_workers=len(callers)) as executor:
+            for future in [executor.submit(caller) for caller in callers]:
+                future.result()
+        assert probe.peak == LIMIT
+
+    def test_slots_are_released(self, hybrid_search, semaphore):
+        async def use_slots():
+            for _ in range(LIMIT * 3):
+                async with hybrid_search.openai_request_slot():
+                    pass
+        asyncio.run(use_slots())
+        assert all(semaphore.acquire(blocking=False) for _ in range(LIMIT))
+
+    def test_cancelled_waiter_hands_its_slot_back(self, hybrid_search, semaphore):
+        for _ in range(LIMIT):
+            semaphore.acquire()
+
+        async def wait_for_slot():
+            async with hybrid_search.openai_request_slot():
+                pass
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(wait_for_slot(), timeout=0.05))
+
+        # Free the slots; the abandoned waiter takes one and must return it
+        for _ in range(LIMIT):
+            semaphore.release()
+        hybrid_search._openai_slot_executor.shutdown(wait=True)
+        assert all(semaphore.acquire(blocking=False) for _ in range(LIMIT))